@@ -1,78 +1,64 @@
+import time
+STARTUP_START = time.perf_counter()
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import time
-from math import inf
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from engine import DEFAULT_RULES, GameState, Rules, SearchCancelled, SearchEngine, SearchTracer, TranspositionTable, apply_move, tree_size
+# Startup: only tkinter and the engine are imported before the first window. The history database is opened on
+# first use, the other modules (history, stats with NumPy, book, parallel) are imported where they are needed and
+# preloaded on a background thread once the welcome screen is up. `--startup-time` prints the time to the first frame.
+PRELOAD_MODULES = ("history", "stats", "book")
 BG_COLOR, PRIMARY_COLOR, ACCENT_COLOR = "#1E1E1E", "#2A2D3E", "#4E9F3D"
 TEXT_COLOR, ENTRY_COLOR, ENTRY_TEXT_COLOR = "#FFFFFF", "#FFFFFF", "#000000"
 SECONDARY_COLOR, BUTTON_COLOR, BUTTON_HOVER = "#3A3F5A", "#4E9F3D", "#3D7A2D"
 WARNING_COLOR, INFO_COLOR = "#D32F2F", "#2196F3"
-
-#Represents each node in our game tree
-class GameState:
-    def __init__(self, number, human_score=0, computer_score=0, is_human_turn=True, parent=None):
-        self.number, self.human_score, self.computer_score = number, human_score, computer_score
-        self.is_human_turn, self.parent, self.children, self.depth = is_human_turn, parent, [], 0 if parent is None else parent.depth + 1
-
-    def add_child(self, child): self.children.append(child)
-    def is_terminal(self): return self.number >= 1200
-
-# Heuristic evaluation function
-    def get_score(self):
-        if self.is_terminal():
-            return inf if self.computer_score > self.human_score else -inf if self.computer_score < self.human_score else 0
-        
-        score_difference = self.computer_score - self.human_score
-        progress_factor = self.number / 1200
-    
-        return score_difference * 2 + progress_factor * 0.5
-
-# Game history,statistics:
-class GameHistory:
-    def __init__(self): 
-        self.history, self.history_file = [], "game_history.dat"
-        self.load_history()
-    
-    def add_result(self, **kwargs):
-        kwargs["timestamp"] = time.time()
-        self.history.append(kwargs)
-        self.save_history()
-    
-    def get_summary(self): return self.history
-    
-    def clear_history(self): 
-        self.history = []
-        self.save_history()
-    
-    def delete_game(self, index):
-        if 0 <= index < len(self.history): 
-            self.history.pop(index)
-            self.save_history()
-            return True
-        return False
-    
-    def save_history(self):
-        try:
-            with open(self.history_file, 'w') as f:
-                for e in self.history:
-                    f.write(f"{e['result']},{e['initial_number']},{e['nodes_visited']},"
-                            f"{e['avg_time']},{e['algorithm']},{e['starting_player']},{e['timestamp']}\n")
-        except Exception as e: print(f"Error saving history: {e}")
-    
-    def load_history(self):
-        try:
-            with open(self.history_file, 'r') as f:
-                self.history = [{
-                    "result": p[0], "initial_number": int(p[1]), "nodes_visited": int(p[2]),
-                    "avg_time": float(p[3]), "algorithm": p[4], "starting_player": p[5],
-                    "timestamp": float(p[6])
-                } for line in f if len(p := line.strip().split(',')) == 7]
-        except FileNotFoundError: pass
-        except Exception as e: print(f"Error loading history: {e}")
+# Search settings: a TIME_BUDGET in seconds switches the computer to iterative deepening up to SEARCH_DEPTH,
+# MOVE_ORDERING picks alpha-beta ordering heuristics from engine.ORDERINGS
+SEARCH_DEPTH, TIME_BUDGET, MOVE_ORDERING = 3, None, ()
+# Entries of the transposition table each game's engine keeps across its moves; 0 disables it
+TRANSPOSITION_TABLE_SIZE = 0
+# Game variant (see engine.Rules), e.g. Rules(target=10**6, multipliers=(2, 3, 4, 5, 6)). Searches in other
+# variants than the original game use VARIANT_TIME_BUDGET when TIME_BUDGET is None, so the time per move stays bounded.
+RULES, VARIANT_TIME_BUDGET = Rules(), 2.0
+# Minimax and alpha-beta split the root across this many processes when it is above 1 (see parallel.py);
+# PARALLEL_SPLIT=2 also splits the second ply. The parallel search has no time budget or tracing.
+PARALLEL_PROCESSES, PARALLEL_SPLIT = 0, 1
+# The computer plays its first moves from an opening book (see book.py) covering this many plies of fixed-depth
+# Minimax/Alpha-beta games (not with RECORD_SEARCH_TREE, a transposition table or the "history" ordering); 0 disables it.
+# The book is loaded, or built, when the first such game starts. Book moves report the nodes and time of the search that built them.
+OPENING_BOOK_PLIES = 4
+# RECORD_SEARCH_TREE keeps the searched positions in the game tree (self.game_tree). With BOUNDED_TREE the
+# subtrees off the played path are dropped after every move and the played move's searched subtree is reused
+# by the next search, so the tree does not grow with every search.
+RECORD_SEARCH_TREE, BOUNDED_TREE = False, True
+# Every move of every game is appended to this move log (see movelog.py), keyed on the game's history id; None disables it
+MOVE_LOG_FILE = "move_log.bin"
+# Set to a file name to append a JSON-lines trace of every computer move (see engine.SearchTracer)
+SEARCH_TRACE_FILE = None
+# How often (ms) the game screen polls a running search for its result and progress
+SEARCH_POLL_MS = 50
+# Results table: (history column, header, width) and the number of rows fetched per scroll page
+RESULT_COLUMNS = [("id", "#", 60), ("result", "Result", 130), ("initial_number", "Initial", 70), ("starting_player", "Starter", 90),
+                  ("algorithm", "Algorithm", 100), ("nodes_visited", "Nodes", 80), ("pruning_rate", "Pruned", 70),
+                  ("avg_time", "Time (s)", 100), ("timestamp", "Date", 110)]
+RESULTS_PAGE_SIZE = 200
+# Aggregates tab: (summary key, header, width, format)
+AGGREGATE_COLUMNS = [("algorithm", "Algorithm", 100, "{}"), ("initial_number", "Initial", 70, "{}"), ("starting_player", "Starter", 90, "{}"),
+                     ("games", "Games", 70, "{}"), ("human_win_rate", "Human %", 80, "{:.0%}"), ("computer_win_rate", "Computer %", 90, "{:.0%}"),
+                     ("draw_rate", "Draw %", 70, "{:.0%}"), ("mean_nodes", "Mean nodes", 90, "{:.1f}"), ("p90_nodes", "P90 nodes", 90, "{:.0f}"),
+                     ("mean_time", "Mean time (s)", 110, "{:.6f}"), ("p90_time", "P90 time (s)", 110, "{:.6f}")]
+
+def preload_modules():
+    for name in PRELOAD_MODULES: __import__(name)
+
+def points(n): return f"{n} point" if n == 1 else f"{n} points"
 
 class NumberGameGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("Reach 1200 first!")
+        self.root.title(f"Reach {RULES.target} first!")
         self.root.geometry("900x700")
         self.center_window()
         self.root.minsize(800, 600)  
@@ -89,8 +75,30 @@ class NumberGameGUI:
         self.style.configure('Warning.TLabel', foreground=WARNING_COLOR)
         self.style.configure('Info.TLabel', foreground=INFO_COLOR)
         self.style.configure('TEntry', fieldbackground=ENTRY_COLOR, foreground=ENTRY_TEXT_COLOR) 
+        self.style.configure('Treeview', background=BG_COLOR, fieldbackground=BG_COLOR, foreground=TEXT_COLOR, rowheight=28)
+        self.style.configure('Treeview.Heading', font=('Helvetica', 11, 'bold'), background=PRIMARY_COLOR, foreground=TEXT_COLOR)
+        # The computer searches on a worker thread so the Tk main loop keeps redrawing and handling input
+        self.search_executor = ThreadPoolExecutor(max_workers=1)
+        self.search_future = self.search_cancel = None
+        self.parallel_executor = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.initialize_game_variables()
         self.create_welcome_screen()
+        self.root.after_idle(lambda: threading.Thread(target=preload_modules, daemon=True).start())
+
+    # The history database is opened on first use: the statistics window or the end of the first game
+    @property
+    def game_history(self):
+        if self._game_history is None:
+            from history import GameHistory
+            self._game_history = GameHistory()
+        return self._game_history
+
+    def on_close(self):
+        self.cancel_search()
+        self.search_executor.shutdown(wait=False)
+        if self.parallel_executor is not None: self.parallel_executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
     def center_window(self):
         self.root.update_idletasks()
@@ -101,20 +109,24 @@ class NumberGameGUI:
 
     def initialize_game_variables(self):
         self.initial_number = self.turn_number = 1
-        self.current_state = self.game_tree = None
+        self.current_state = self.game_tree = self.engine = None
         self.starting_player = self.algorithm = ""
         self.is_human_turn = True
         self.nodes_visited = self.total_nodes_visited = 0
+        self.total_pruned_moves = self.total_generated_moves = 0
         self.computer_move_count = self.total_computer_time = 0
-        self.game_history = GameHistory()
+        self._game_history = None
         self.result_window = None
         self.warning_label = self.given_number_label = self.calculation_label = None
-        self.table_labels = []
+        self.results_tree = self.results_scrollbar = self.aggregates_tree = self.stats_aggregator = None
+        self.results_filters, self.stats_labels = {}, []
+        self.results_sort, self.results_loaded, self.results_total = ("id", False), 0, 0
         self.next_button = None
         self.multiplier_buttons = []
 
     # WELCOME SCREEN IMPLEMENTATION
     def create_welcome_screen(self):
+        self.cancel_search()
         self.clear_screen()
         self.show_number_entry_screen()
 
@@ -123,7 +135,7 @@ class NumberGameGUI:
         main_frame = ttk.Frame(self.root, padding=40, style='Game.TFrame')
         main_frame.pack(expand=True, fill=tk.BOTH)
         ttk.Label(main_frame, text="STEP 1: ENTER STARTING NUMBER", style='Header.TLabel').pack(pady=(0, 20))
-        ttk.Label(main_frame, text="Choose a number between 8 and 18", style='Subheader.TLabel').pack(pady=(0, 40))
+        ttk.Label(main_frame, text=f"Choose a number between {RULES.start_range[0]} and {RULES.start_range[1]}", style='Subheader.TLabel').pack(pady=(0, 40))
         input_frame = ttk.Frame(main_frame)
         input_frame.pack(pady=15)
         ttk.Label(input_frame, text="Starting Number:", style='Subheader.TLabel').grid(row=0, column=0, padx=10, sticky="w")
@@ -165,7 +177,7 @@ class NumberGameGUI:
         algo_frame = ttk.Frame(main_frame)
         algo_frame.pack(pady=15)
         self.algo_var = tk.StringVar()
-        for i, (text, val) in enumerate([("Minimax", "minimax"), ("Alpha-Beta", "alphabeta")], 1):
+        for i, (text, val) in enumerate([("Minimax", "minimax"), ("Alpha-Beta", "alphabeta"), ("Exact", "exact")], 1):
             ttk.Radiobutton(algo_frame, text=text, variable=self.algo_var, value=val,
                            command=lambda v=val: self.set_algorithm(v)).grid(row=0, column=i, padx=10)
         self.warning_label = ttk.Label(main_frame, text="", style='Warning.TLabel')
@@ -178,8 +190,8 @@ class NumberGameGUI:
     def validate_number_and_proceed(self):
         try:
             self.initial_number = int(self.number_entry.get())
-            if not 8 <= self.initial_number <= 18:
-                self.warning_label.config(text="Number must be between 8 and 18")
+            if self.initial_number not in RULES.starts():
+                self.warning_label.config(text=f"Number must be between {RULES.start_range[0]} and {RULES.start_range[1]}")
                 return
             self.show_player_selection_screen()
         except ValueError:
@@ -211,21 +223,44 @@ class NumberGameGUI:
     
     def start_game_session(self):
         self.clear_screen()
-        self.current_state = GameState(self.initial_number)
-        self.game_tree = self.current_state
         self.turn_number = 0
         self.is_human_turn = (self.starting_player == "human")
+        self.current_state = GameState(self.initial_number, is_human_turn=self.is_human_turn, rules=RULES)
+        self.game_tree = self.current_state
+        time_budget = VARIANT_TIME_BUDGET if TIME_BUDGET is None and RULES != DEFAULT_RULES else TIME_BUDGET
+        self.engine = self.create_engine(time_budget)
         self.nodes_visited = self.total_nodes_visited = self.computer_move_count = self.total_computer_time = 0
+        self.total_pruned_moves = self.total_generated_moves = 0
+        self.moves = []
         self.create_game_screen()
         self.turn_label.config(text=f"TURN {self.turn_number}")
         if not self.is_human_turn: self.root.after(500, self.computer_move)
 
+    def create_engine(self, time_budget):
+        if PARALLEL_PROCESSES > 1:
+            from parallel import PARALLEL_ALGORITHMS, ParallelSearch
+            if self.algorithm in PARALLEL_ALGORITHMS:
+                # One process pool serves every game
+                if self.parallel_executor is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    self.parallel_executor = ProcessPoolExecutor(PARALLEL_PROCESSES)
+                return ParallelSearch(self.algorithm, SEARCH_DEPTH, split=PARALLEL_SPLIT, ordering=MOVE_ORDERING, rules=RULES,
+                                      executor=self.parallel_executor)
+        book = None
+        if OPENING_BOOK_PLIES > 0 and time_budget is None and not RECORD_SEARCH_TREE and not TRANSPOSITION_TABLE_SIZE:
+            from book import BOOK_ALGORITHMS, BOOK_ORDERINGS, get_book
+            if self.algorithm in BOOK_ALGORITHMS and set(MOVE_ORDERING) <= set(BOOK_ORDERINGS): book = get_book(self.algorithm, SEARCH_DEPTH, MOVE_ORDERING, RULES, OPENING_BOOK_PLIES)
+        tt = TranspositionTable(TRANSPOSITION_TABLE_SIZE) if TRANSPOSITION_TABLE_SIZE else None
+        return SearchEngine(self.algorithm, depth=SEARCH_DEPTH, tt=tt, time_budget=time_budget, ordering=MOVE_ORDERING,
+                            tracer=SearchTracer() if SEARCH_TRACE_FILE else None, rules=RULES, book=book,
+                            record_tree=RECORD_SEARCH_TREE)
+
     def create_game_screen(self):
         main_frame = ttk.Frame(self.root, style='Game.TFrame')
         main_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20) 
         header_frame = ttk.Frame(main_frame)
         header_frame.pack(fill=tk.X, pady=(10, 20))
-        ttk.Label(header_frame, text="REACH 1200 FIRST!", style='Header.TLabel').pack(side=tk.LEFT)
+        ttk.Label(header_frame, text=f"REACH {RULES.target} FIRST!", style='Header.TLabel').pack(side=tk.LEFT)
         self.turn_label = ttk.Label(header_frame, text=f"TURN {self.turn_number}", style='Subheader.TLabel')
         self.turn_label.pack(side=tk.RIGHT)
         board_frame = ttk.Frame(main_frame, padding=20)
@@ -247,7 +282,7 @@ class NumberGameGUI:
         btn_frame = ttk.Frame(board_frame)
         btn_frame.pack(pady=20)
         self.multiplier_buttons = []
-        for m in [2, 3, 4]:
+        for m in RULES.multipliers:
             btn = ttk.Button(btn_frame, text=str(m), command=lambda m=m: self.make_move(m), width=8)
             btn.pack(side=tk.LEFT, padx=15)
             self.multiplier_buttons.append(btn)
@@ -279,19 +314,52 @@ class NumberGameGUI:
         self.computer_move()
 
     def computer_move(self):
-        for btn in self.multiplier_buttons: btn.state(['!disabled'])
-        self.nodes_visited = 0
-        start_time = time.perf_counter()
+        for btn in self.multiplier_buttons: btn.state(['disabled'])
+        self.cancel_search()
+        # Book moves need no search, so they are played straight away
+        result = self.engine.book_move(self.current_state)
+        if result is not None:
+            self.play_computer_move(result)
+            return
+        self.search_cancel = threading.Event()
+        self.search_future = self.search_executor.submit(self.engine.search, self.current_state, True, self.search_cancel)
+        self.move_info_label.config(text="Computer is thinking...", foreground=INFO_COLOR)
+        self.root.after(SEARCH_POLL_MS, self.poll_search, self.search_future)
+
+    # Runs on the Tk main loop: shows progress until the worker finishes, then plays its move
+    def poll_search(self, future):
+        if future is not self.search_future: return
+        if not future.done():
+            depth, nodes = self.engine.progress
+            self.move_info_label.config(text=f"Computer is thinking... depth {depth}, {nodes} nodes")
+            self.root.after(SEARCH_POLL_MS, self.poll_search, future)
+            return
+        self.search_future = self.search_cancel = None
+        try: result = future.result()
+        except SearchCancelled: return
+        except Exception as e:
+            # The computer's move can be retried with NEXT TURN
+            self.move_info_label.config(text=f"Search failed: {e}", foreground=WARNING_COLOR)
+            self.next_button.pack(pady=15)
+            return
+        self.play_computer_move(result)
 
-        if self.algorithm == "minimax":
-            best_multiplier, _ = self.minimax(self.current_state, depth=3, is_maximizing=True)
-        else:
-            best_multiplier, _ = self.alphabeta(self.current_state, depth=3, alpha=-inf, beta=inf, is_maximizing=True)
+    def cancel_search(self):
+        if self.search_future is not None:
+            self.search_cancel.set()
+            self.search_future.cancel()
+        self.search_future = self.search_cancel = None
 
-        self.total_computer_time += time.perf_counter() - start_time
+    def play_computer_move(self, result):
+        for btn in self.multiplier_buttons: btn.state(['!disabled'])
+        self.nodes_visited = result.nodes_visited
+
+        self.total_computer_time += result.elapsed
         self.computer_move_count += 1
         self.total_nodes_visited += self.nodes_visited
-        self.update_game_state(best_multiplier, "Computer")
+        self.total_pruned_moves += result.pruned_moves
+        self.total_generated_moves += result.generated_moves
+        self.update_game_state(result.multiplier, "Computer", result)
         self.is_human_turn = True
         
         if self.current_state.is_terminal():
@@ -303,77 +371,26 @@ class NumberGameGUI:
             self.turn_number += 1
             self.turn_label.config(text=f"TURN {self.turn_number}")
 
-# Algorithms implementation:
-    def minimax(self, state, depth, is_maximizing):
-        self.nodes_visited += 1
-        if depth == 0 or state.is_terminal():
-            return None, state.get_score()
-        
-        best_score = -inf if is_maximizing else inf
-        best_multiplier = None
-        
-        for m in [2, 3, 4]:
-            new_state = self.apply_move(state, m, not is_maximizing)
-            _, score = self.minimax(new_state, depth-1, not is_maximizing)
-            
-            if (is_maximizing and score > best_score) or (not is_maximizing and score < best_score) or best_multiplier is None:
-                best_score, best_multiplier = score, m
-                    
-        return best_multiplier, best_score
-
-    def alphabeta(self, state, depth, alpha, beta, is_maximizing):
-        self.nodes_visited += 1
-        if depth == 0 or state.is_terminal():
-            return None, state.get_score()
-        
-        best_score = -inf if is_maximizing else inf
-        best_multiplier = None
-        
-        for m in [2, 3, 4]:
-            new_state = self.apply_move(state, m, not is_maximizing)
-            _, score = self.alphabeta(new_state, depth-1, alpha, beta, not is_maximizing)
-            
-            if is_maximizing:
-                if score > best_score or best_multiplier is None:
-                    best_score, best_multiplier = score, m
-                alpha = max(alpha, best_score)
-            else:
-                if score < best_score or best_multiplier is None:
-                    best_score, best_multiplier = score, m
-                beta = min(beta, best_score)
-            
-            if beta <= alpha:
-                break
-                
-        return best_multiplier, best_score
-
-    # Game mechanism:
-    def apply_move(self, state, multiplier, is_human=True):
-        new_number = state.number * multiplier
-        hs, cs = state.human_score, state.computer_score
-        
-        if new_number % 2 == 0:
-            hs, cs = (hs, cs-1) if is_human else (hs-1, cs)
-        else:
-            hs, cs = (hs+1, cs) if is_human else (hs, cs+1)
-
-        new_state = GameState(new_number, hs, cs, not is_human, state)
-        state.add_child(new_state)
-        return new_state
-
-    def update_game_state(self, multiplier, player):
-        prev_num = self.current_state.number
-        self.current_state = self.apply_move(self.current_state, multiplier, player=="Human")
+    def update_game_state(self, multiplier, player, result=None):
+        previous = self.current_state
+        prev_num = previous.number
+        self.current_state = apply_move(previous, multiplier, player=="Human", reuse=BOUNDED_TREE)
+        if BOUNDED_TREE: previous.prune(self.current_state)
+        s = self.current_state
+        self.moves.append(dict(ply=len(self.moves), is_human=player == "Human", multiplier=multiplier, number=s.number,
+                               human_score=s.human_score, computer_score=s.computer_score,
+                               nodes=result.nodes_visited if result else 0, elapsed=result.elapsed if result else 0.0,
+                               depth=result.depth if result else 0))
         opponent = "Computer" if player == "Human" else "Human"
         self.given_number_label.config(text=f"Given number: {prev_num}")
         self.calculation_label.config(text=f"Calculation: {prev_num} × {multiplier} = {self.current_state.number}")
         self.number_label.config(text=f"Current number: {self.current_state.number}")
         
         if self.current_state.number % 2 == 0:
-            msg = f"{player} chose {multiplier}. Even number! {opponent} loses 1 point"
+            msg = f"{player} chose {multiplier}. Even number! {opponent} loses {points(RULES.even_penalty)}"
             self.move_info_label.config(text=msg, foreground=WARNING_COLOR)
         else:
-            msg = f"{player} chose {multiplier}. Odd number! {player} gains 1 point"
+            msg = f"{player} chose {multiplier}. Odd number! {player} gains {points(RULES.odd_bonus)}"
             self.move_info_label.config(text=msg, foreground=ACCENT_COLOR)
             
         self.score_label.config(text=f"SCORE: Human {self.current_state.human_score} | Computer {self.current_state.computer_score}")
@@ -389,22 +406,32 @@ class NumberGameGUI:
         else:
             result, color = "DRAW!", INFO_COLOR
         avg_time = self.total_computer_time / self.computer_move_count if self.computer_move_count > 0 else 0
-        self.game_history.add_result(
+        pruning_rate = self.total_pruned_moves / self.total_generated_moves if self.total_generated_moves > 0 else 0.0
+        game = self.game_history.add_result(
             result=result.split('!')[0], initial_number=self.initial_number,
             nodes_visited=self.total_nodes_visited, avg_time=avg_time,
-            algorithm=self.algorithm, starting_player=self.starting_player
+            algorithm=self.algorithm, starting_player=self.starting_player, pruning_rate=pruning_rate
         )
         self.move_info_label.config(text=f"GAME OVER - {result}", foreground=color)
+        if MOVE_LOG_FILE and "id" in game:
+            from movelog import MoveLogWriter
+            try:
+                with MoveLogWriter(MOVE_LOG_FILE) as log: log.add_game(game["id"], self.moves)
+            except (OSError, ValueError, OverflowError) as e: print(f"Error saving move log: {e}")
+        if self.engine.tracer is not None:
+            try: self.engine.tracer.to_jsonl(SEARCH_TRACE_FILE, "a")
+            except OSError as e: print(f"Error saving search trace: {e}")
+            self.engine.tracer.clear()
         time_frame = ttk.Frame(self.root)
         time_frame.pack(pady=10)
         ttk.Label(time_frame, text=f"Avg. time per move: {avg_time:.6f}s").pack()
+        nodes, size = tree_size(self.game_tree)
+        ttk.Label(time_frame, text=f"Game tree: {nodes} nodes, {size / 1024:.1f} KB retained").pack()
 
-        if hasattr(self, 'result_window') and self.result_window and self.result_window.winfo_exists():
-            self.update_results_table()
+        if self.result_window and self.result_window.winfo_exists() and "id" in game:
+            self.append_results_row(game)
 
     def display_experiment_results(self):
-        if not hasattr(self, 'game_history'): return
-        summary = self.game_history.get_summary()
         if self.result_window is not None and self.result_window.winfo_exists():
             self.result_window.lift()
             return
@@ -423,70 +450,149 @@ class NumberGameGUI:
         ttk.Label(container, text="GAME STATISTICS", style='Header.TLabel').pack(pady=(0, 20))
         stats_frame = ttk.Frame(container)
         stats_frame.pack(fill=tk.X, pady=(0, 20))
-        total_games = len(summary)
-        stats = [
-            f"Total Games: {total_games}",
-            f"Human Wins: {sum(1 for g in summary if g['result'] == 'HUMAN WINS')}",
-            f"Computer Wins: {sum(1 for g in summary if g['result'] == 'COMPUTER WINS')}",
-            f"Draws: {sum(1 for g in summary if g['result'] == 'DRAW')}",
-            f"Minimax Games: {sum(1 for g in summary if g['algorithm'] == 'minimax')}",
-            f"Alpha-Beta Games: {sum(1 for g in summary if g['algorithm'] == 'alphabeta')}"
-        ]
-        for i, stat in enumerate(stats):
-            ttk.Label(stats_frame, text=stat, style='Subheader.TLabel').grid(row=i//3, column=i%3, sticky="w", padx=20, pady=5)
-        table_container = ttk.Frame(container)
+        self.stats_labels = []
+        for i in range(7):
+            label = ttk.Label(stats_frame, style='Subheader.TLabel')
+            label.grid(row=i//3, column=i%3, sticky="w", padx=20, pady=5)
+            self.stats_labels.append(label)
+        notebook = ttk.Notebook(container)
+        notebook.pack(expand=True, fill=tk.BOTH)
+        games_tab, aggregates_tab = ttk.Frame(notebook), ttk.Frame(notebook)
+        notebook.add(games_tab, text="Games")
+        notebook.add(aggregates_tab, text="Aggregates")
+        filter_frame = ttk.Frame(games_tab)
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+        self.results_filters = {}
+        for col, (text, column, values) in enumerate([
+                ("Algorithm:", "algorithm", ["minimax", "alphabeta", "exact"]),
+                ("Initial:", "initial_number", list(RULES.starts())),
+                ("Starter:", "starting_player", ["human", "computer"])]):
+            ttk.Label(filter_frame, text=text).grid(row=0, column=2*col, padx=(20, 5), sticky="w")
+            box = ttk.Combobox(filter_frame, values=["All"] + values, state="readonly", width=12)
+            box.set("All")
+            box.bind("<<ComboboxSelected>>", lambda e: self.reload_results_table())
+            box.grid(row=0, column=2*col+1, sticky="w")
+            self.results_filters[column] = box
+        table_container = ttk.Frame(games_tab)
         table_container.pack(expand=True, fill=tk.BOTH)
-        canvas = tk.Canvas(table_container, bg=SECONDARY_COLOR, highlightthickness=0, bd=0)
-        scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        headers = ["#", "Result", "Initial", "Starter", "Algorithm", "Nodes", "Time (s)", "Date"]
-        for col, header in enumerate(headers):
-            ttk.Label(scrollable_frame, text=header, font=('Helvetica', 11, 'bold'), 
-                     background=PRIMARY_COLOR, padding=8).grid(row=0, column=col, sticky="nsew")
-        self.table_labels = []
-        for row, game in enumerate(summary, 1):
-            bg = SECONDARY_COLOR if row % 2 == 0 else BG_COLOR
-            time_str = f"{game['avg_time']:.6f}".rstrip('0').rstrip('.') if '.' in f"{game['avg_time']:.6f}" else f"{game['avg_time']:.6f}"
-            date_str = time.strftime('%d/%m %H:%M', time.localtime(game['timestamp']))
-            cols = [str(row), game['result'], str(game['initial_number']), 
-                   game['starting_player'].title(), game['algorithm'].title(), 
-                   str(game['nodes_visited']), time_str, date_str]
-            row_labels = []
-            for col, text in enumerate(cols):
-                label = ttk.Label(scrollable_frame, text=text, background=bg, padding=8)
-                label.grid(row=row, column=col, sticky="nsew")
-                row_labels.append(label)
-            self.table_labels.append(row_labels)
-
-        for i in range(len(headers)):
-            scrollable_frame.grid_columnconfigure(i, weight=1)
-        
+        # Treeview rows are loaded from the store a page at a time as the table is scrolled
+        self.results_tree = ttk.Treeview(table_container, columns=[c for c, _, _ in RESULT_COLUMNS], show="headings", selectmode="extended")
+        for column, header, width in RESULT_COLUMNS:
+            self.results_tree.heading(column, text=header, command=lambda c=column: self.sort_results_table(c))
+            self.results_tree.column(column, width=width, anchor=tk.CENTER)
+        self.results_tree.tag_configure('odd', background=BG_COLOR)
+        self.results_tree.tag_configure('even', background=SECONDARY_COLOR)
+        self.results_scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.results_tree.yview)
+        self.results_tree.configure(yscrollcommand=self.on_results_scroll)
+        self.results_tree.pack(side="left", fill="both", expand=True)
+        self.results_scrollbar.pack(side="right", fill="y")
+        # Aggregates per algorithm, initial number and starter; the aggregator follows the history's appends
+        if self.stats_aggregator is None:
+            from stats import StatsAggregator
+            self.stats_aggregator = StatsAggregator.from_history(self.game_history)
+            self.game_history.listeners.append(self.stats_aggregator)
+        self.aggregates_tree = ttk.Treeview(aggregates_tab, columns=[c for c, _, _, _ in AGGREGATE_COLUMNS], show="headings")
+        for column, header, width, _ in AGGREGATE_COLUMNS:
+            self.aggregates_tree.heading(column, text=header)
+            self.aggregates_tree.column(column, width=width, anchor=tk.CENTER)
+        aggregates_scrollbar = ttk.Scrollbar(aggregates_tab, orient="vertical", command=self.aggregates_tree.yview)
+        self.aggregates_tree.configure(yscrollcommand=aggregates_scrollbar.set)
+        self.aggregates_tree.pack(side="left", fill="both", expand=True)
+        aggregates_scrollbar.pack(side="right", fill="y")
+        self.results_sort = ("id", False)
+        self.reload_results_table()
+
         btn_frame = ttk.Frame(container)
         btn_frame.pack(pady=(20, 0))
         ttk.Button(btn_frame, text="DELETE SELECTED", command=self.delete_selected_game).pack(side=tk.LEFT, padx=15)
         ttk.Button(btn_frame, text="CLEAR HISTORY", command=self.clear_all_history).pack(side=tk.LEFT, padx=15)
         self.result_window.protocol("WM_DELETE_WINDOW", self.on_results_close)
 
+    def refresh_stats(self):
+        count = self.game_history.count
+        stats = [
+            f"Total Games: {count()}",
+            f"Human Wins: {count(result='HUMAN WINS')}",
+            f"Computer Wins: {count(result='COMPUTER WINS')}",
+            f"Draws: {count(result='DRAW')}",
+            f"Minimax Games: {count(algorithm='minimax')}",
+            f"Alpha-Beta Games: {count(algorithm='alphabeta')}",
+            f"Exact Games: {count(algorithm='exact')}"
+        ]
+        for label, stat in zip(self.stats_labels, stats): label.config(text=stat)
+        self.aggregates_tree.delete(*self.aggregates_tree.get_children())
+        for row in self.stats_aggregator.summary():
+            self.aggregates_tree.insert("", tk.END, values=[fmt.format(row[c]) for c, _, _, fmt in AGGREGATE_COLUMNS])
+
+    def get_results_filters(self):
+        filters = {column: box.get() for column, box in self.results_filters.items() if box.get() != "All"}
+        if "initial_number" in filters: filters["initial_number"] = int(filters["initial_number"])
+        return filters
+
+    # Sorting and filtering run in the store; only the rows scrolled into view are loaded
+    def reload_results_table(self):
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.results_loaded, self.results_total = 0, self.game_history.count(**self.get_results_filters())
+        self.refresh_stats()
+        self.load_results_page()
+
+    def load_results_page(self):
+        order_by, descending = self.results_sort
+        games = self.game_history.page(self.results_loaded, RESULTS_PAGE_SIZE, order_by, descending, **self.get_results_filters())
+        for game in games: self.insert_results_row(game)
+
+    def insert_results_row(self, game, index=tk.END):
+        tag = 'even' if self.results_loaded % 2 else 'odd'
+        self.results_tree.insert("", index, iid=str(game['id']), values=self.format_results_row(game), tags=(tag,))
+        self.results_loaded += 1
+
+    @staticmethod
+    def format_results_row(game):
+        time_str = f"{game['avg_time']:.6f}".rstrip('0').rstrip('.') if '.' in f"{game['avg_time']:.6f}" else f"{game['avg_time']:.6f}"
+        date_str = time.strftime('%d/%m %H:%M', time.localtime(game['timestamp']))
+        return [str(game['id']), game['result'], str(game['initial_number']),
+                game['starting_player'].title(), game['algorithm'].title(),
+                str(game['nodes_visited']), f"{game.get('pruning_rate', 0.0):.0%}", time_str, date_str]
+
+    def on_results_scroll(self, first, last):
+        self.results_scrollbar.set(first, last)
+        if float(last) > 0.9 and self.results_loaded < self.results_total: self.load_results_page()
+
+    def sort_results_table(self, column):
+        order_by, descending = self.results_sort
+        self.results_sort = (column, not descending if column == order_by else False)
+        self.reload_results_table()
+
+    # A new game is added in place when it belongs at either end of the loaded rows, otherwise the view reloads
+    def append_results_row(self, game):
+        filters = self.get_results_filters()
+        if any(game[column] != value for column, value in filters.items()):
+            return self.refresh_stats()
+        order_by, descending = self.results_sort
+        self.results_total += 1
+        if order_by == "id" and descending: self.insert_results_row(game, 0)
+        elif order_by == "id" and self.results_loaded == self.results_total - 1: self.insert_results_row(game)
+        elif order_by != "id":
+            return self.reload_results_table()
+        self.refresh_stats()
+
     def on_results_close(self):
         if self.result_window:
             self.result_window.destroy()
             self.result_window = None
 
     def delete_selected_game(self):
+        selection = self.results_tree.selection()
+        if selection:
+            for iid in selection: self.game_history.delete_game_id(int(iid))
+            self.reload_results_table()
+            return
         try:
             selected = simpledialog.askstring("Delete Game", "Enter game number to delete:", parent=self.result_window)
             if selected is None: return
-        
-            selected_index = int(selected) - 1
-            if self.game_history.delete_game(selected_index):
-                self.result_window.destroy()
-                self.result_window = None
-                self.display_experiment_results()  
+
+            if self.game_history.delete_game_id(int(selected)):
+                self.reload_results_table()
             else:
                 messagebox.showwarning("Invalid Selection", "Please enter a valid game number", parent=self.result_window)
         except ValueError:
@@ -498,38 +604,9 @@ class NumberGameGUI:
             self.update_results_table()
 
     def update_results_table(self):
-        if not hasattr(self, 'result_window') or not self.result_window.winfo_exists():
+        if not self.result_window or not self.result_window.winfo_exists():
             return
-            
-        summary = self.game_history.get_summary()
-        
-        for row_labels in self.table_labels:
-            for label in row_labels: label.destroy()
-        self.table_labels = []
-        
-        try:
-            scrollable_frame = self.result_window.winfo_children()[0].winfo_children()[3].winfo_children()[0]
-            headers = ["#", "Result", "Initial", "Starter", "Algorithm", "Nodes", "Time (s)", "Date"]
-            for col, header in enumerate(headers):
-                ttk.Label(scrollable_frame, text=header, font=('Helvetica', 11, 'bold'), 
-                         background=PRIMARY_COLOR, padding=8).grid(row=0, column=col, sticky="nsew")
-            
-            for row, game in enumerate(summary, 1):
-                bg = SECONDARY_COLOR if row % 2 == 0 else BG_COLOR
-                time_str = f"{game['avg_time']:.6f}".rstrip('0').rstrip('.') if '.' in f"{game['avg_time']:.6f}" else f"{game['avg_time']:.6f}"
-                date_str = time.strftime('%d/%m %H:%M', time.localtime(game['timestamp']))
-                cols = [str(row), game['result'], str(game['initial_number']), 
-                       game['starting_player'].title(), game['algorithm'].title(), 
-                       str(game['nodes_visited']), time_str, date_str]
-                row_labels = []
-                for col, text in enumerate(cols):
-                    label = ttk.Label(scrollable_frame, text=text, background=bg, padding=8)
-                    label.grid(row=row, column=col, sticky="nsew")
-                    row_labels.append(label)
-                self.table_labels.append(row_labels)
-            for i in range(len(headers)):
-                scrollable_frame.grid_columnconfigure(i, weight=1)    
-        except Exception as e: print(f"Error updating results table: {e}")
+        self.reload_results_table()
 
     def clear_screen(self, window=None):
         target = window if window else self.root
@@ -538,4 +615,8 @@ class NumberGameGUI:
 if __name__ == "__main__":
     root = tk.Tk()
     game = NumberGameGUI(root)
-    root.mainloop()
\ No newline at end of file
+    if "--startup-time" in sys.argv:
+        root.update()
+        print(f"Startup: {(time.perf_counter() - STARTUP_START) * 1000:.1f} ms to the first frame")
+        root.destroy()
+    else: root.mainloop()
\ No newline at end of file
@@ -0,0 +1,106 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from engine import DEFAULT_RULES, ORDERINGS, GameState, SearchEngine, TranspositionTable, add_rules_arguments, rules_from_args
+
+# Reproducible search benchmark:
+# for every initial number, depth 1..N and algorithm, the computer's first move is searched and
+# nodes visited, wall time (best of `repeat` runs), net memory (blocks and bytes still allocated after the search)
+# and peak memory are recorded. Results are written as JSON and can be compared against a saved baseline
+# that was run with the same SETTINGS.
+BENCH_ALGORITHMS = ("minimax", "alphabeta")
+# Search settings a baseline must share to be comparable, with their values for baselines that predate them
+SETTINGS = dict(tt_size=0, ordering=[], vectorized=False, target=DEFAULT_RULES.target, multipliers=list(DEFAULT_RULES.multipliers))
+
+def measure(algorithm, initial_number, depth, repeat=5, tt_size=0, ordering=(), vectorized=False, rules=DEFAULT_RULES):
+    def engine(): return SearchEngine(algorithm, depth, TranspositionTable(tt_size) if tt_size else None, ordering=ordering, vectorized=vectorized)
+    state = GameState(initial_number, is_human_turn=False, rules=rules)
+    times = []
+    for _ in range(repeat):
+        e = engine()
+        start_time = time.perf_counter()
+        result = e.search(state)
+        times.append(time.perf_counter() - start_time)
+
+    # Memory is measured in a separate run because tracing slows the search down
+    e = engine()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    e.search(state)
+    _, peak = tracemalloc.get_traced_memory()
+    net = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+    return dict(algorithm=algorithm, initial_number=initial_number, depth=depth, nodes=result.nodes_visited,
+                pruning_rate=result.pruning_rate, multiplier=result.multiplier, time=min(times),
+                net_blocks=sum(s.count_diff for s in net), net_bytes=sum(s.size_diff for s in net),
+                peak_bytes=peak)
+
+def run(algorithms=BENCH_ALGORITHMS, numbers=None, max_depth=6, repeat=5, tt_size=0, ordering=(), vectorized=False, rules=DEFAULT_RULES):
+    numbers = rules.starts() if numbers is None else numbers
+    results = [measure(a, n, d, repeat, tt_size, ordering, vectorized, rules) for a in algorithms for n in numbers for d in range(1, max_depth + 1)]
+    meta = dict(python=platform.python_version(), machine=platform.machine(), timestamp=time.time(),
+                max_depth=max_depth, repeat=repeat, tt_size=tt_size, ordering=list(ordering), vectorized=vectorized,
+                target=rules.target, multipliers=list(rules.multipliers))
+    return dict(meta=meta, results=results)
+
+# Node counts are deterministic and must not grow; time and peak memory may grow by `tolerance`
+# (a fraction) plus a small absolute noise floor before they count as a regression
+def compare(results, baseline, tolerance=0.25, min_time=20e-6, min_bytes=1024):
+    meta, base_meta = results["meta"], baseline.get("meta", {})
+    changed = [f"{k} {base_meta.get(k, v)} -> {meta[k]}" for k, v in SETTINGS.items() if base_meta.get(k, v) != meta[k]]
+    if changed: raise ValueError(f"The baseline was run with other settings: {', '.join(changed)}")
+    base = {(r["algorithm"], r["initial_number"], r["depth"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results["results"]:
+        b = base.get((r["algorithm"], r["initial_number"], r["depth"]))
+        if b is None: continue
+        where = f"{r['algorithm']} n={r['initial_number']} depth={r['depth']}"
+        if r["nodes"] > b["nodes"]:
+            regressions.append(f"{where}: nodes {b['nodes']} -> {r['nodes']}")
+        if r["time"] > b["time"] * (1 + tolerance) + min_time:
+            regressions.append(f"{where}: time {b['time']:.6f}s -> {r['time']:.6f}s")
+        if r["peak_bytes"] > b["peak_bytes"] * (1 + tolerance) + min_bytes:
+            regressions.append(f"{where}: peak memory {b['peak_bytes']} -> {r['peak_bytes']} bytes")
+    return regressions
+
+def print_table(results):
+    print(f"{'algorithm':<10} {'n':>3} {'depth':>5} {'nodes':>8} {'pruned':>7} {'time (s)':>10} {'net blocks':>10} {'peak (B)':>9}")
+    for r in results["results"]:
+        print(f"{r['algorithm']:<10} {r['initial_number']:>3} {r['depth']:>5} {r['nodes']:>8} {r['pruning_rate']:>7.1%} "
+              f"{r['time']:>10.6f} {r['net_blocks']:>10} {r['peak_bytes']:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Minimax vs alpha-beta search benchmark")
+    parser.add_argument("--algorithms", nargs="+", choices=BENCH_ALGORITHMS, default=list(BENCH_ALGORITHMS))
+    parser.add_argument("--numbers", nargs="+", type=int, help="initial numbers (default: the start range of the rules)")
+    add_rules_arguments(parser)
+    parser.add_argument("--max-depth", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement (the fastest is kept)")
+    parser.add_argument("--tt-size", type=int, default=0, help="transposition table entries (0 = disabled)")
+    parser.add_argument("--ordering", nargs="*", choices=ORDERINGS, default=[], help="alpha-beta move ordering heuristics")
+    parser.add_argument("--vectorized", action="store_true", help="run minimax level by level with NumPy")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative time/memory growth")
+    parser.add_argument("--quiet", action="store_true", help="do not print the results table")
+    args = parser.parse_args()
+
+    results = run(args.algorithms, args.numbers, args.max_depth, args.repeat, args.tt_size, args.ordering, args.vectorized,
+                  rules_from_args(parser, args))
+    if not args.quiet: print_table(results)
+    if args.output:
+        with open(args.output, "w") as f: json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f: baseline = json.load(f)
+        try: regressions = compare(results, baseline, args.tolerance)
+        except ValueError as e: parser.error(str(e))
+        for line in regressions: print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regressions against {args.baseline}")
+        if regressions: sys.exit(1)
+
+if __name__ == "__main__":
+    main()
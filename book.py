@@ -0,0 +1,125 @@
+import argparse
+import os
+import struct
+from engine import DEFAULT_RULES, ORDERINGS, Board, SearchEngine
+
+# Opening book:
+# the computer's move in every position reachable in the first `plies` plies from any starting number, with
+# either player starting, precomputed with the same engine settings the game uses. The engine answers these
+# positions from the book instead of searching (SearchEngine(book=...)); the moves are the ones the search
+# would play. Positions are keyed on (number, computer-human score difference), like the transposition table.
+# Every entry keeps the nodes, time and pruning of the search that built it, and book moves report those, so
+# per-game statistics stay comparable with searched games.
+# The "history" ordering carries over between the searches of a game, so its moves depend on the earlier
+# searches and cannot be precomputed; books only use the other orderings.
+# Books are stored in small binary files and loaded (or built and saved) the first time they are needed.
+PLIES = 4
+MAGIC, VERSION = b"ZSOB", 2
+HEADER, ENTRY = struct.Struct("<4sBBBBBQiiB"), struct.Struct("<QidBQdQQQ")
+BOOK_ALGORITHMS = ("minimax", "alphabeta")
+BOOK_ORDERINGS = ("pv", "killer", "odd")
+
+def book_file(algorithm, depth, ordering=(), rules=DEFAULT_RULES):
+    name = "_".join(("opening_book", algorithm, str(depth)) + tuple(ordering))
+    if rules != DEFAULT_RULES:
+        name += f"_{rules.target}_{'-'.join(map(str, rules.multipliers))}_{rules.even_penalty}-{rules.odd_bonus}"
+    return name + ".bin"
+
+class OpeningBook:
+    def __init__(self, algorithm="alphabeta", depth=3, ordering=(), rules=DEFAULT_RULES, plies=PLIES):
+        if algorithm not in BOOK_ALGORITHMS: raise ValueError(f"Unknown algorithm: {algorithm}")
+        if unknown := set(ordering) - set(BOOK_ORDERINGS): raise ValueError(f"Books cannot use move ordering: {', '.join(sorted(unknown))}")
+        self.algorithm, self.depth, self.rules, self.plies = algorithm, depth, rules, plies
+        self.ordering = tuple(o for o in ORDERINGS if o in ordering)
+        # (number, score difference) with the computer to move -> (multiplier, score, nodes, elapsed, cutoffs, pruned, generated)
+        self.entries = {}
+
+    def __len__(self): return len(self.entries)
+
+    def settings(self): return self.algorithm, self.depth, self.ordering, self.rules
+
+    # The entry for a position with the computer to move, or None
+    def probe(self, state): return self.entries.get((state.number, state.computer_score - state.human_score))
+
+    def build(self):
+        positions = {(number, 0, starter == "human") for number in self.rules.starts() for starter in ("human", "computer")}
+        for _ in range(self.plies):
+            following = set()
+            for number, difference, is_human_turn in positions:
+                board = Board(number, 0, difference, is_human_turn, self.rules)
+                if board.is_terminal(): continue
+                if not is_human_turn and (number, difference) not in self.entries:
+                    result = SearchEngine(self.algorithm, self.depth, ordering=self.ordering, rules=self.rules).search(board)
+                    self.entries[number, difference] = (result.multiplier, result.score, result.nodes_visited, result.elapsed,
+                                                        result.cutoffs, result.pruned_moves, result.generated_moves)
+                for m in self.rules.multipliers:
+                    board.make(m)
+                    following.add((board.number, board.computer_score - board.human_score, board.is_human_turn))
+                    board.unmake()
+            positions = following
+        return self
+
+    # Positions whose book move or score differs from a fresh search with the book's settings
+    def verify(self):
+        mismatches = []
+        for (number, difference), entry in self.entries.items():
+            result = SearchEngine(self.algorithm, self.depth, ordering=self.ordering, rules=self.rules).search(
+                Board(number, 0, difference, False, self.rules))
+            if (result.multiplier, result.score) != entry[:2]: mismatches.append((number, difference))
+        return mismatches
+
+    # Binary book: header (magic, version, algorithm, depth, ordering bits, plies, target, even penalty, odd bonus,
+    # multiplier count), the multipliers, then one 61-byte (number, difference, score, multiplier, nodes, elapsed, cutoffs,
+# pruned, generated) record per position.
+    # Like solver tables, books are written under a temporary name and renamed into place.
+    def save(self, path=None):
+        rules, mask = self.rules, sum(1 << i for i, o in enumerate(ORDERINGS) if o in self.ordering)
+        path = book_file(*self.settings()) if path is None else path
+        with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, BOOK_ALGORITHMS.index(self.algorithm), self.depth, mask, self.plies,
+                                rules.target, rules.even_penalty, rules.odd_bonus, len(rules.multipliers)) + bytes(rules.multipliers))
+            f.write(b"".join(ENTRY.pack(n, d, score, m, *stats) for (n, d), (m, score, *stats) in self.entries.items()))
+        os.replace(f.name, path)
+
+    # Returns False (and loads nothing) if the file is missing, truncated or was built for other settings
+    def load(self, path=None):
+        try:
+            with open(book_file(*self.settings()) if path is None else path, "rb") as f: data = f.read()
+        except FileNotFoundError: return False
+        if len(data) < HEADER.size: return False
+        magic, version, algorithm, depth, mask, plies, target, even_penalty, odd_bonus, n = HEADER.unpack_from(data)
+        rules, ordering = self.rules, tuple(o for i, o in enumerate(ORDERINGS) if mask >> i & 1)
+        if (magic, version, algorithm, depth, ordering, plies) != (MAGIC, VERSION, BOOK_ALGORITHMS.index(self.algorithm),
+                                                                    self.depth, self.ordering, self.plies): return False
+        if (target, even_penalty, odd_bonus, tuple(data[HEADER.size:HEADER.size + n])) != \
+                (rules.target, rules.even_penalty, rules.odd_bonus, rules.multipliers): return False
+        if (len(data) - HEADER.size - n) % ENTRY.size: return False
+        self.entries = {(number, d): (m, score, *stats) for number, d, score, m, *stats in ENTRY.iter_unpack(data[HEADER.size + n:])}
+        return True
+
+_books = {}
+
+# Shared book per engine settings: loaded from its file, or built and saved on first use
+def get_book(algorithm="alphabeta", depth=3, ordering=(), rules=DEFAULT_RULES, plies=PLIES):
+    book = OpeningBook(algorithm, depth, ordering, rules, plies)
+    key = book.settings() + (plies,)
+    if key not in _books:
+        if not book.load():
+            book.build()
+            try: book.save()
+            except OSError as e: print(f"Error saving opening book: {e}")
+        _books[key] = book
+    return _books[key]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build opening books")
+    parser.add_argument("--algorithms", nargs="+", choices=BOOK_ALGORITHMS, default=list(BOOK_ALGORITHMS))
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--ordering", nargs="*", choices=BOOK_ORDERINGS, default=[])
+    parser.add_argument("--plies", type=int, default=PLIES)
+    args = parser.parse_args()
+    for algorithm in args.algorithms:
+        book = OpeningBook(algorithm, args.depth, args.ordering, plies=args.plies).build()
+        book.save()
+        path, mismatches = book_file(*book.settings()), book.verify()
+        print(f"{path}: {len(book)} positions, {os.path.getsize(path)} bytes, {len(mismatches)} differ from a fresh search")
@@ -0,0 +1,598 @@
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from math import inf
+
+# Search engine for the number game. It has no GUI dependencies, so scripts,
+# services and tests can import it without tkinter or a display.
+# "exact" answers from the solver's precomputed game-value table instead of searching
+ALGORITHMS = ("minimax", "alphabeta", "exact")
+# Alpha-beta move ordering heuristics, tried in this priority order:
+# "pv" the transposition table / previous iteration best move, "killer" moves that caused a cut-off at
+# the same ply, "odd" multipliers that produce an odd number, "history" moves with the most cut-offs so far
+ORDERINGS = ("pv", "killer", "odd", "history")
+
+# NumPy is only needed by vectorized searches and Rules.evaluate_many and is imported on first use, which keeps importing the engine fast
+np = None
+
+def _load_numpy():
+    global np
+    if np is None:
+        try: import numpy as np
+        except ImportError: return False
+    return True
+
+# Game rules: players multiply the number by one of the multipliers until it reaches target; an even result
+# costs the opponent even_penalty points, an odd one earns the mover odd_bonus points. The human picks the
+# starting number from start_range. GameState, Board, SearchEngine and Solver take a Rules object
+# (default: the original game); e.g. Rules(target=10**6, multipliers=(2, 3, 4, 5, 6)).
+@dataclass(frozen=True)
+class Rules:
+    target: int = 1200
+    multipliers: tuple = (2, 3, 4)
+    start_range: tuple = (8, 18)
+    even_penalty: int = 1
+    odd_bonus: int = 1
+
+    def __post_init__(self):
+        object.__setattr__(self, "multipliers", tuple(self.multipliers))
+        object.__setattr__(self, "start_range", tuple(self.start_range))
+        # Every move must grow the number, or a game could go on forever
+        if not self.multipliers or min(self.multipliers) < 2: raise ValueError("Multipliers must be at least 2")
+        if len(set(self.multipliers)) != len(self.multipliers): raise ValueError("Duplicate multipliers")
+        if not 1 <= self.start_range[0] <= self.start_range[1] < self.target: raise ValueError("Invalid start range")
+        # Solver tables, opening books and move logs store a multiplier in one byte, a number in eight and
+        # points and scores in four
+        if max(self.multipliers) > 255: raise ValueError("Multipliers must be at most 255")
+        if (self.target - 1) * max(self.multipliers) >= 2 ** 64: raise ValueError("Target too large")
+        if self.max_plies(self.start_range[0]) * max(abs(self.even_penalty), abs(self.odd_bonus)) >= 2 ** 31:
+            raise ValueError("Points too large")
+
+    def starts(self): return range(self.start_range[0], self.start_range[1] + 1)
+
+    # The most plies a game can still last from number: every move by the smallest multiplier
+    def max_plies(self, number):
+        plies, smallest = 0, min(self.multipliers)
+        while number < self.target: number, plies = number * smallest, plies + 1
+        return plies
+
+    # Heuristic evaluation function
+    def evaluate(self, number, human_score, computer_score):
+        if number >= self.target:
+            return inf if computer_score > human_score else -inf if computer_score < human_score else 0
+
+        score_difference = computer_score - human_score
+        progress_factor = number / self.target
+
+        return score_difference * 2 + progress_factor * 0.5
+
+    # evaluate() over NumPy arrays of positions
+    def evaluate_many(self, numbers, human_scores, computer_scores):
+        if not _load_numpy(): raise ImportError("evaluate_many needs NumPy")
+        score_difference = computer_scores - human_scores
+        final = np.where(score_difference > 0, inf, np.where(score_difference < 0, -inf, 0.0))
+        return np.where(numbers >= self.target, final, score_difference * 2 + numbers / self.target * 0.5)
+
+    # Scores after the mover reaches new_number: even costs the opponent points, odd earns the mover points
+    def score_move(self, new_number, human_score, computer_score, is_human):
+        if new_number % 2 == 0:
+            return (human_score, computer_score-self.even_penalty) if is_human else (human_score-self.even_penalty, computer_score)
+        return (human_score+self.odd_bonus, computer_score) if is_human else (human_score, computer_score+self.odd_bonus)
+
+DEFAULT_RULES = Rules()
+MULTIPLIERS, TARGET, START_RANGE = DEFAULT_RULES.multipliers, DEFAULT_RULES.target, DEFAULT_RULES.start_range
+evaluate, score_move = DEFAULT_RULES.evaluate, DEFAULT_RULES.score_move
+
+# --target/--multipliers options of the scripts that play or search a game variant
+def add_rules_arguments(parser):
+    parser.add_argument("--target", type=int, default=DEFAULT_RULES.target, help="the number that ends the game")
+    parser.add_argument("--multipliers", nargs="+", type=int, default=list(DEFAULT_RULES.multipliers))
+
+def rules_from_args(parser, args):
+    try: return Rules(args.target, args.multipliers)
+    except ValueError as e: parser.error(str(e))
+
+#Represents each node in our game tree; children inherit the rules of their parent
+class GameState:
+    def __init__(self, number, human_score=0, computer_score=0, is_human_turn=True, parent=None, rules=None):
+        self.number, self.human_score, self.computer_score = number, human_score, computer_score
+        self.is_human_turn, self.parent, self.children, self.depth = is_human_turn, parent, [], 0 if parent is None else parent.depth + 1
+        self.rules = rules if rules is not None else DEFAULT_RULES if parent is None else parent.rules
+
+    def add_child(self, child): self.children.append(child)
+    def key(self): return self.number, self.human_score, self.computer_score, self.is_human_turn
+    def is_terminal(self): return self.number >= self.rules.target
+    def get_score(self): return self.rules.evaluate(self.number, self.human_score, self.computer_score)
+
+    # Drops every child except keep (e.g. the move that was played). The dropped subtrees are unlinked
+    # so they are freed right away instead of waiting for the cycle collector.
+    def prune(self, keep=None):
+        dropped = [c for c in self.children if c is not keep]
+        self.children = [c for c in self.children if c is keep]
+        while dropped:
+            node = dropped.pop()
+            node.parent = None
+            dropped.extend(node.children)
+            node.children = []
+
+# (nodes, bytes) retained by the game tree under root: every GameState with its attribute dict and children list
+def tree_size(root):
+    nodes, size, stack = 0, 0, [root]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        size += sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.children)
+        stack.extend(node.children)
+    return nodes, size
+
+# Game mechanism:
+# with reuse=True a child already recorded by a search (SearchEngine(record_tree=True)) is returned instead of a
+# new node, so its searched subtree becomes the starting point of the next search
+def apply_move(state, multiplier, is_human=True, reuse=False):
+    new_number = state.number * multiplier
+    hs, cs = state.rules.score_move(new_number, state.human_score, state.computer_score, is_human)
+    if reuse:
+        for child in state.children:
+            if child.key() == (new_number, hs, cs, not is_human): return child
+    new_state = GameState(new_number, hs, cs, not is_human, state)
+    state.add_child(new_state)
+    return new_state
+
+# Compact search state: a single mutable board per search. Moves are made and unmade in place,
+# so searching allocates no GameState nodes and keeps no parent/children links alive.
+class Board:
+    __slots__ = ("number", "human_score", "computer_score", "is_human_turn", "rules", "_undo")
+
+    def __init__(self, number, human_score=0, computer_score=0, is_human_turn=True, rules=DEFAULT_RULES):
+        self.number, self.human_score, self.computer_score = number, human_score, computer_score
+        self.is_human_turn, self.rules, self._undo = is_human_turn, rules, []
+
+    @classmethod
+    def from_state(cls, state, is_human_turn=None, rules=None):
+        return cls(state.number, state.human_score, state.computer_score,
+                   state.is_human_turn if is_human_turn is None else is_human_turn, state.rules if rules is None else rules)
+
+    def key(self): return self.number, self.human_score, self.computer_score, self.is_human_turn
+    def is_terminal(self): return self.number >= self.rules.target
+    def get_score(self): return self.rules.evaluate(self.number, self.human_score, self.computer_score)
+
+    def make(self, multiplier):
+        self._undo.append((self.number, self.human_score, self.computer_score))
+        new_number = self.number * multiplier
+        self.human_score, self.computer_score = self.rules.score_move(new_number, self.human_score, self.computer_score, self.is_human_turn)
+        self.number, self.is_human_turn = new_number, not self.is_human_turn
+
+    def unmake(self):
+        self.number, self.human_score, self.computer_score = self._undo.pop()
+        self.is_human_turn = not self.is_human_turn
+
+# Transposition table:
+# The same position is reached through many move orders (2x3 vs 3x2, 4 vs 2x2), so searched
+# values are cached. Positions are keyed on (number, computer-human score difference, side to move):
+# get_score and every later move only depend on the score difference, not on the two scores.
+EXACT, LOWER, UPPER = 0, 1, 2
+REPLACEMENT_POLICIES = ("depth", "always")
+# Oldest entries the "depth" policy picks the shallowest of when the table is full
+EVICTION_WINDOW = 8
+
+class TranspositionTable:
+    def __init__(self, max_entries=100_000, replacement="depth"):
+        if replacement not in REPLACEMENT_POLICIES: raise ValueError(f"Unknown replacement policy: {replacement}")
+        if max_entries < 1: raise ValueError("A transposition table needs room for at least one entry")
+        self.entries, self.max_entries, self.replacement = {}, max_entries, replacement
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def __len__(self): return len(self.entries)
+
+    @staticmethod
+    def key(state, is_maximizing): return state.number, state.computer_score - state.human_score, is_maximizing
+
+    # Returns (depth, flag, score, multiplier, horizon) if the entry was searched at least as deep as requested;
+    # horizon is False when no leaf of the searched subtree was cut off by the depth limit
+    def probe(self, key, depth):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= depth:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    # "depth" keeps the deeper of two results for a position, "always" keeps the newest one.
+    # When the table is full, "always" evicts the oldest position and "depth" the shallowest of the
+    # EVICTION_WINDOW oldest ones, so deep results outlive shallow ones without ever becoming permanent.
+    def store(self, key, depth, flag, score, multiplier, horizon=True):
+        old = self.entries.get(key)
+        if old is not None:
+            if self.replacement == "depth" and old[0] > depth: return
+        elif len(self.entries) >= self.max_entries:
+            if self.replacement == "depth":
+                victim = min(islice(self.entries.items(), EVICTION_WINDOW), key=lambda item: item[1][0])[0]
+            else: victim = next(iter(self.entries))
+            del self.entries[victim]
+            self.evictions += 1
+        self.entries[key] = (depth, flag, score, multiplier, horizon)
+        self.stores += 1
+
+    # Best move stored for a position at any depth, for move ordering
+    def move(self, key):
+        entry = self.entries.get(key)
+        return None if entry is None else entry[3]
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+# Search tracing:
+# attach a SearchTracer to an engine (SearchEngine(tracer=...)) to get one record per searched move with
+# nodes per ply, cut-offs, branching factor and timings. Without a tracer the engine only pays one
+# attribute check per node. Records export as JSON lines or as a Chrome trace (chrome://tracing, Perfetto).
+class SearchTracer:
+    def __init__(self):
+        self.records, self.origin = [], time.perf_counter()
+
+    # root is the searched position as Board.key()
+    def record(self, engine, root, is_maximizing, result, start_time, nodes_per_ply, expanded):
+        searched = result.nodes_visited - len(result.iterations)
+        number, human_score, computer_score, _ = root
+        self.records.append(dict(
+            move=len(self.records), algorithm=engine.algorithm, number=number, human_score=human_score,
+            computer_score=computer_score, is_maximizing=is_maximizing, multiplier=result.multiplier,
+            score=_json_score(result.score), depth=result.depth, nodes=result.nodes_visited, nodes_per_ply=nodes_per_ply,
+            cutoffs=result.cutoffs, pruning_rate=result.pruning_rate, branching_factor=searched / expanded if expanded else 0.0,
+            tt_hits=result.tt_hits, tt_misses=result.tt_misses, start=start_time - self.origin, elapsed=result.elapsed,
+            iterations=[dict(i, score=_json_score(i["score"])) for i in result.iterations]))
+
+    def to_jsonl(self, path, mode="w"):
+        with open(path, mode) as f:
+            for r in self.records: f.write(json.dumps(r) + "\n")
+
+    # One complete ("X") event per move with its iterations nested underneath, timestamps in microseconds
+    def to_chrome_trace(self, path):
+        events = []
+        for r in self.records:
+            name = f"move {r['move']}: {r['number']} x {r['multiplier']}"
+            events.append(dict(name=name, cat=r["algorithm"], ph="X", pid=1, tid=1,
+                               ts=r["start"] * 1e6, dur=r["elapsed"] * 1e6, args={k: v for k, v in r.items() if k != "iterations"}))
+            ts = r["start"] * 1e6
+            for i in r["iterations"]:
+                events.append(dict(name=f"depth {i['depth']}", cat="iteration", ph="X", pid=1, tid=1, ts=ts, dur=i["elapsed"] * 1e6, args=i))
+                ts += i["elapsed"] * 1e6
+            events.append(dict(name="nodes", ph="C", pid=1, tid=1, ts=r["start"] * 1e6, args={"nodes": r["nodes"]}))
+        with open(path, "w") as f: json.dump(dict(traceEvents=events, displayTimeUnit="ms"), f)
+
+    def clear(self): self.records = []
+
+# JSON has no infinity; forced wins and losses are written as "inf" / "-inf"
+def _json_score(score): return str(score) if score in (inf, -inf) else score
+
+class SearchTimeout(Exception): pass
+class SearchCancelled(Exception): pass
+
+# Outcome of one engine call: the chosen multiplier, its backed-up score and the search cost.
+# iterations has one {depth, nodes, elapsed, multiplier, score, completed} entry per searched depth.
+@dataclass
+class SearchResult:
+    multiplier: int
+    score: float
+    nodes_visited: int
+    elapsed: float
+    tt_hits: int = 0
+    tt_misses: int = 0
+    depth: int = 0
+    iterations: list = field(default_factory=list)
+    cutoffs: int = 0
+    pruned_moves: int = 0
+    generated_moves: int = 0
+
+    # Share of the generated moves that alpha-beta cut-offs skipped
+    @property
+    def pruning_rate(self): return self.pruned_moves / self.generated_moves if self.generated_moves else 0.0
+
+# With record_tree=True every searched position is also kept as a GameState child of the
+# searched state (or of self.tree when a Board is searched), e.g. for visualizing the game tree.
+# Positions already in the tree (e.g. from the previous move's search) are reused instead of added again.
+# With a time_budget (seconds) or iterative=True the engine deepens from 1 up to depth (None = until
+# the game tree is exhausted) and returns the deepest completed iteration when the budget runs out.
+# vectorized=True runs minimax level by level on NumPy arrays (batch_minimax) when NumPy is installed;
+# it searches the same tree but does not use the transposition table or record the tree.
+# rules is the game variant to search (default: the searched state's rules). On variants with large targets or
+# many multipliers the tree grows quickly; a time_budget keeps the time per move bounded there.
+# With an opening book (book.get_book with the same settings) the computer's book positions are answered without searching;
+# the result reports the nodes and time of the search that built the entry. A transposition table carries results over
+# between searches, so an engine with one cannot use a book.
+class SearchEngine:
+    def __init__(self, algorithm="alphabeta", depth=3, tt=None, record_tree=False, time_budget=None, iterative=False, ordering=(),
+                 tracer=None, vectorized=False, rules=None, book=None):
+        if algorithm not in ALGORITHMS: raise ValueError(f"Unknown algorithm: {algorithm}")
+        if unknown := set(ordering) - set(ORDERINGS): raise ValueError(f"Unknown move ordering: {', '.join(sorted(unknown))}")
+        if depth is None and not (iterative or time_budget): raise ValueError("A fixed-depth search needs a depth")
+        self.algorithm, self.depth, self.tt, self.record_tree, self.rules = algorithm, depth, tt, record_tree, rules
+        self.time_budget, self.iterative = time_budget, iterative or time_budget is not None
+        self.solver = None
+        if algorithm == "exact":
+            from solver import get_solver
+            self.solver = get_solver(rules or DEFAULT_RULES)
+        self.ordering = tuple(o for o in ORDERINGS if o in ordering)
+        self.vectorized = vectorized and algorithm == "minimax" and not record_tree and _load_numpy()
+        if book is not None and (self.iterative or tt is not None or book.settings() != (algorithm, depth, self.ordering, rules or book.rules)):
+            raise ValueError("The opening book was built for other search settings")
+        self.book = book
+        self.nodes_visited = self.cutoffs = self.pruned_moves = self.generated_moves = 0
+        self.tree = self._node = self._deadline = self._cancel = None
+        self.tracer, self._ply_nodes, self._expanded = tracer, None, 0
+        self._killers, self._history = {}, {}
+        self._root_depth, self._moves, self._root_moves, self._horizon = 0, MULTIPLIERS, MULTIPLIERS, False
+
+    # (depth of the running iteration, nodes visited so far); safe to poll from another thread
+    @property
+    def progress(self): return self._root_depth, self.nodes_visited
+
+    # The computer is the maximizing player; pass is_maximizing=False to search for the human side.
+    # Setting the optional cancel event (e.g. from a GUI thread) aborts the search with SearchCancelled.
+    # alpha and beta narrow alpha-beta's root window (e.g. for a subtree of a parallel search); a score
+    # outside the window is only a bound.
+    def search(self, state, is_maximizing=True, cancel=None, alpha=-inf, beta=inf):
+        if self.solver is not None: return self.lookup(state, is_maximizing)
+        result = self.book_move(state, is_maximizing)
+        if result is not None: return result
+        self._cancel = cancel
+        self.nodes_visited = self.cutoffs = self.pruned_moves = self.generated_moves = 0
+        self._killers.clear()
+        hits, misses = (self.tt.hits, self.tt.misses) if self.tt is not None else (0, 0)
+        board = Board.from_state(state, not is_maximizing, self.rules)
+        if self.record_tree:
+            self.tree = state if isinstance(state, GameState) else GameState(*board.key(), rules=board.rules)
+            recorded = len(self.tree.children)
+        if self.tracer is not None: self._ply_nodes, self._expanded, root = [], 0, board.key()
+        start_time = time.perf_counter()
+        deadline = None if self.time_budget is None else start_time + self.time_budget
+        if not self.iterative: depths = (self.depth,)
+        # Without a depth the longest possible game bounds the iterations
+        else: depths = range(1, (self.depth or max(1, board.rules.max_plies(board.number))) + 1)
+
+        best_multiplier, best_score, iterations = None, 0, []
+        moves = self._moves = self._root_moves = board.rules.multipliers
+        # batch_minimax holds numbers in int64, so variants whose numbers can pass 2**63 are searched recursively
+        vectorized = self.vectorized and (board.rules.target - 1) * max(moves) < 2 ** 63
+        for depth in depths:
+            if self.record_tree:
+                del self.tree.children[recorded:]
+                self._node = self.tree
+            # The first iteration always completes so there is a move to return
+            self._root_depth, self._horizon, self._deadline = depth, False, deadline if iterations else None
+            if self._ply_nodes is not None: self._ply_nodes.extend([0] * (depth + 1 - len(self._ply_nodes)))
+            nodes, iteration_start = self.nodes_visited, time.perf_counter()
+            try:
+                if vectorized:
+                    m, score = self.batch_minimax(board, depth, is_maximizing)
+                elif self.algorithm == "minimax":
+                    m, score = self.minimax(board, depth, is_maximizing)
+                else:
+                    m, score = self.alphabeta(board, depth, alpha, beta, is_maximizing)
+            except SearchTimeout:
+                if cancel is not None and cancel.is_set():
+                    self._node = self._deadline = self._cancel = self._ply_nodes = None
+                    raise SearchCancelled()
+                iterations.append(dict(depth=depth, nodes=self.nodes_visited - nodes, elapsed=time.perf_counter() - iteration_start,
+                                       multiplier=None, score=None, completed=False))
+                break
+            iterations.append(dict(depth=depth, nodes=self.nodes_visited - nodes, elapsed=time.perf_counter() - iteration_start,
+                                   multiplier=m, score=score, completed=True))
+            best_multiplier, best_score = m, score
+            # The previous iteration's best move is searched first in the next one
+            if m is not None: self._root_moves = (m,) + tuple(x for x in moves if x != m)
+            # Stop once no leaf was cut off by the depth limit: a deeper search would repeat this one
+            if not self._horizon or deadline is not None and time.perf_counter() >= deadline: break
+
+        self._node = self._deadline = self._cancel = None
+        self._root_moves = moves
+
+        elapsed = time.perf_counter() - start_time
+        if self.tt is not None: hits, misses = self.tt.hits - hits, self.tt.misses - misses
+        reached = max((i["depth"] for i in iterations if i["completed"]), default=0)
+        result = SearchResult(best_multiplier, best_score, self.nodes_visited, elapsed, hits, misses, reached, iterations,
+                              self.cutoffs, self.pruned_moves, self.generated_moves)
+        if self._ply_nodes is not None:
+            self.tracer.record(self, root, is_maximizing, result, start_time, self._ply_nodes, self._expanded)
+            self._ply_nodes = None
+        return result
+
+    # The opening book's answer for the position, or None when search() has to search it. Recording the tree
+    # needs the searched positions, so the book is not used then.
+    def book_move(self, state, is_maximizing=True):
+        if self.book is None or not is_maximizing or self.record_tree: return None
+        entry = self.book.probe(state)
+        if entry is None: return None
+        m, score, nodes, elapsed, cutoffs, pruned, generated = entry
+        return SearchResult(m, score, nodes, elapsed, depth=self.depth, cutoffs=cutoffs, pruned_moves=pruned, generated_moves=generated,
+                            iterations=[dict(depth=self.depth, nodes=nodes, elapsed=elapsed, multiplier=m, score=score, completed=True)])
+
+    # Exact play: the score is the final score difference (computer - human) under perfect play
+    def lookup(self, state, is_maximizing=True):
+        start_time = time.perf_counter()
+        if self.rules is None and state.rules != self.solver.rules:
+            from solver import get_solver
+            self.solver = get_solver(state.rules)
+        self.nodes_visited = 1
+        multiplier = None if state.number >= self.solver.rules.target else self.solver.best_move(state, is_maximizing)
+        score = self.solver.value(state, not is_maximizing)
+        elapsed = time.perf_counter() - start_time
+        return SearchResult(multiplier, score, 1, elapsed, iterations=[dict(depth=0, nodes=1, elapsed=elapsed,
+                            multiplier=multiplier, score=score, completed=True)])
+
+    def _enter(self, board, depth):
+        self.nodes_visited += 1
+        if self._ply_nodes is not None: self._ply_nodes[self._root_depth - depth] += 1
+        if not self.nodes_visited & 255 and self._stopped(): raise SearchTimeout()
+        if board.is_terminal(): return True
+        if depth == 0:
+            self._horizon = True
+            return True
+        return False
+
+    def _stopped(self):
+        return (self._deadline is not None and time.perf_counter() > self._deadline
+                or self._cancel is not None and self._cancel.is_set())
+
+# Algorithms implementation:
+    def minimax(self, board, depth, is_maximizing):
+        if self._enter(board, depth):
+            return None, board.get_score()
+
+        tt = self.tt
+        if tt is not None:
+            key = tt.key(board, is_maximizing)
+            entry = tt.probe(key, depth)
+            if entry is not None and entry[1] == EXACT:
+                self._horizon = self._horizon or entry[4]
+                return entry[3], entry[2]
+
+        if self._ply_nodes is not None: self._expanded += 1
+        best_score = -inf if is_maximizing else inf
+        best_multiplier = None
+
+        # _horizon is tracked per subtree, so the TT entry records whether this one hit the depth limit
+        record, horizon, self._horizon = self._node is not None, self._horizon, False
+        for m in (self._root_moves if depth == self._root_depth else self._moves):
+            board.make(m)
+            if record: self._record(board)
+            _, score = self.minimax(board, depth-1, not is_maximizing)
+            board.unmake()
+            if record: self._node = self._node.parent
+
+            if (is_maximizing and score > best_score) or (not is_maximizing and score < best_score) or best_multiplier is None:
+                best_score, best_multiplier = score, m
+
+        if tt is not None: tt.store(key, depth, EXACT, best_score, best_multiplier, self._horizon)
+        self._horizon = horizon or self._horizon
+        return best_multiplier, best_score
+
+    # Full-width minimax one level at a time: all positions of a ply are expanded into their children at once
+    # (child i*k+j is position i times the j-th of k multipliers), the leaves are scored with Rules.evaluate_many
+    # and the values are backed up with max/min over each group of k. A finished game is carried down as k
+    # copies of itself, so every level keeps its shape and the game's value is its own score, as in minimax().
+    # Expansion stops early once every position is finished.
+    def batch_minimax(self, board, depth, is_maximizing):
+        self.nodes_visited += 1
+        if self._ply_nodes is not None: self._ply_nodes[0] += 1
+        numbers = np.array([board.number], dtype=np.int64)
+        human_scores, computer_scores = np.array([board.human_score], dtype=np.int64), np.array([board.computer_score], dtype=np.int64)
+        rules, width = board.rules, len(self._moves)
+        is_human, finished, levels = board.is_human_turn, numbers >= rules.target, 0
+        while levels < depth and not finished.all():
+            if self._stopped(): raise SearchTimeout()
+            moves = np.array(self._root_moves if levels == 0 else self._moves, dtype=np.int64)
+            expanded = int(np.count_nonzero(~finished))
+            self.nodes_visited += width * expanded
+            if self._ply_nodes is not None:
+                self._ply_nodes[levels + 1] += width * expanded
+                self._expanded += expanded
+            # Moves change nothing in a finished game; otherwise an even number costs the opponent points
+            # and an odd number earns the mover points
+            live = np.repeat(~finished, width)
+            numbers = np.where(finished[:, None], numbers[:, None], numbers[:, None] * moves).ravel()
+            even, odd = live & (numbers % 2 == 0), live & (numbers % 2 == 1)
+            even, odd = even * rules.even_penalty, odd * rules.odd_bonus
+            human_scores, computer_scores = np.repeat(human_scores, width), np.repeat(computer_scores, width)
+            if is_human: human_scores, computer_scores = human_scores + odd, computer_scores - even
+            else: human_scores, computer_scores = human_scores - even, computer_scores + odd
+            is_human, finished, levels = not is_human, numbers >= rules.target, levels + 1
+        if levels == depth and not finished.all(): self._horizon = True
+
+        values, best_multiplier = rules.evaluate_many(numbers, human_scores, computer_scores), None
+        for ply in reversed(range(levels)):
+            values = values.reshape(-1, width)
+            maximizing = is_maximizing == (ply % 2 == 0)
+            if ply == 0: best_multiplier = self._root_moves[int(values[0].argmax() if maximizing else values[0].argmin())]
+            values = values.max(axis=1) if maximizing else values.min(axis=1)
+        return best_multiplier, float(values[0])
+
+    def alphabeta(self, board, depth, alpha, beta, is_maximizing):
+        if self._enter(board, depth):
+            return None, board.get_score()
+
+        tt, alpha_orig, beta_orig, hash_move, reached = self.tt, alpha, beta, None, False
+        if tt is not None:
+            key = tt.key(board, is_maximizing)
+            entry = tt.probe(key, depth)
+            if entry is not None:
+                _, flag, score, m, reached = entry
+                self._horizon = self._horizon or reached
+                if flag == EXACT: return m, score
+                if flag == LOWER: alpha = max(alpha, score)
+                else: beta = min(beta, score)
+                if beta <= alpha: return m, score
+            hash_move = tt.move(key)
+
+        if self._ply_nodes is not None: self._expanded += 1
+        best_score = -inf if is_maximizing else inf
+        best_multiplier = None
+
+        # _horizon is tracked per subtree, so the TT entry records whether this one hit the depth limit;
+        # a window narrowed by a TT bound inherits that bound's horizon
+        record, horizon, self._horizon = self._node is not None, self._horizon, reached
+        moves = self._root_moves if depth == self._root_depth else self._moves
+        if self.ordering: moves = self._order(board, depth, is_maximizing, moves, hash_move)
+        self.generated_moves += len(moves)
+        for i, m in enumerate(moves):
+            board.make(m)
+            if record: self._record(board)
+            _, score = self.alphabeta(board, depth-1, alpha, beta, not is_maximizing)
+            board.unmake()
+            if record: self._node = self._node.parent
+
+            if is_maximizing:
+                if score > best_score or best_multiplier is None:
+                    best_score, best_multiplier = score, m
+                alpha = max(alpha, best_score)
+            else:
+                if score < best_score or best_multiplier is None:
+                    best_score, best_multiplier = score, m
+                beta = min(beta, best_score)
+
+            if beta <= alpha:
+                self.cutoffs += 1
+                self.pruned_moves += len(moves) - i - 1
+                if self.ordering: self._store_cutoff(depth, is_maximizing, m)
+                break
+
+        # Fail-soft bounds: a score outside the original window only bounds the true value
+        if tt is not None:
+            flag = UPPER if best_score <= alpha_orig else LOWER if best_score >= beta_orig else EXACT
+            tt.store(key, depth, flag, best_score, best_multiplier, self._horizon)
+        self._horizon = horizon or self._horizon
+        return best_multiplier, best_score
+
+    # Stable sort, so ties keep the previous order (the rules' multipliers or the root's previous-best order)
+    def _order(self, board, depth, is_maximizing, moves, hash_move):
+        ordering = self.ordering
+        killers = self._killers.get(self._root_depth - depth, ()) if "killer" in ordering else ()
+        if "pv" in ordering and hash_move is None and depth == self._root_depth: hash_move = moves[0]
+        odd, history = "odd" in ordering, self._history if "history" in ordering else None
+        def rank(m):
+            return ("pv" in ordering and m == hash_move, m in killers, odd and board.number * m % 2 == 1,
+                    history.get((is_maximizing, m), 0) if history is not None else 0)
+        return sorted(moves, key=rank, reverse=True)
+
+    # Killers are kept per ply (the two most recent); history scores per side and move persist across searches
+    def _store_cutoff(self, depth, is_maximizing, m):
+        ply = self._root_depth - depth
+        killers = self._killers.get(ply, ())
+        if m not in killers: self._killers[ply] = (m,) + killers[:1]
+        key = (is_maximizing, m)
+        self._history[key] = self._history.get(key, 0) + depth * depth
+
+    def _record(self, board):
+        key = board.key()
+        for child in self._node.children:
+            if child.key() == key:
+                self._node = child
+                return
+        child = GameState(board.number, board.human_score, board.computer_score, board.is_human_turn, self._node)
+        self._node.add_child(child)
+        self._node = child
+
+def best_move(state, algorithm="alphabeta", depth=3, is_maximizing=True, tt=None, ordering=(), rules=None):
+    return SearchEngine(algorithm, depth, tt, ordering=ordering, rules=rules).search(state, is_maximizing)
@@ -0,0 +1,167 @@
+import csv
+import os
+import sqlite3
+import sys
+import time
+
+# Game history,statistics:
+# Games are stored in SQLite: adding a game is a single INSERT instead of rewriting a file, rows are read
+# lazily page by page, and algorithm, initial number and starting player are indexed for filtering.
+# An old game_history.dat file is imported the first time the database is opened (once: clearing the history does not re-import it).
+# Listeners (e.g. stats.StatsAggregator) get add(game) for every stored game and reset(history) after deletions.
+COLUMNS = ("result", "initial_number", "nodes_visited", "avg_time", "algorithm", "starting_player", "timestamp", "pruning_rate")
+INDEXED = ("algorithm", "initial_number", "starting_player", "result")
+LEGACY_FILE = "game_history.dat"
+INSERT = f"INSERT INTO games ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+class GameHistory:
+    def __init__(self, history_file="game_history.db", legacy_file=LEGACY_FILE):
+        self.history_file, self.listeners = history_file, []
+        self.db = sqlite3.connect(history_file)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, result TEXT, initial_number INTEGER, "
+                        "nodes_visited INTEGER, avg_time REAL, algorithm TEXT, starting_player TEXT, timestamp REAL, "
+                        "pruning_rate REAL DEFAULT 0)")
+        for column in INDEXED:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS games_{column} ON games ({column})")
+        self.db.commit()
+        # user_version 1 records that the legacy file was looked at, so clearing the history does not bring it back
+        if self.db.execute("PRAGMA user_version").fetchone()[0] < 1:
+            if legacy_file and len(self) == 0 and os.path.exists(legacy_file):
+                self.extend(self.load_legacy(legacy_file))
+            with self.db: self.db.execute("PRAGMA user_version = 1")
+
+    # Returns the stored game, including its "id"
+    def add_result(self, **kwargs):
+        kwargs["timestamp"] = time.time()
+        kwargs.setdefault("pruning_rate", 0.0)
+        try:
+            with self.db: kwargs["id"] = self.db.execute(INSERT, self._row(kwargs)).lastrowid
+        except sqlite3.Error as e:
+            print(f"Error saving history: {e}")
+            return kwargs
+        for listener in self.listeners: listener.add(kwargs)
+        return kwargs
+
+    # Appends many results in one transaction; returns them with their "id"s
+    def extend(self, results):
+        results = [dict(r) for r in results]
+        try:
+            with self.db:
+                for game in results: game["id"] = self.db.execute(INSERT, self._row(game)).lastrowid
+        except sqlite3.Error as e:
+            print(f"Error saving history: {e}")
+            return []
+        for listener in self.listeners:
+            for game in results: listener.add(game)
+        return results
+
+    @staticmethod
+    def _row(e):
+        return (e["result"], e["initial_number"], e["nodes_visited"], e["avg_time"], e["algorithm"],
+                e["starting_player"], e.get("timestamp", time.time()), e.get("pruning_rate", 0.0))
+
+    def __len__(self): return self.count()
+
+    # filters: column=value pairs on any of COLUMNS, e.g. count(algorithm="minimax")
+    def count(self, **filters):
+        where, params = self._where(filters)
+        return self.db.execute(f"SELECT COUNT(*) FROM games{where}", params).fetchone()[0]
+
+    # One page of games as dicts, oldest first unless order_by/descending say otherwise
+    def page(self, offset=0, limit=100, order_by="id", descending=False, **filters):
+        if order_by != "id" and order_by not in COLUMNS: raise ValueError(f"Unknown column: {order_by}")
+        where, params = self._where(filters)
+        order = f"{order_by} {'DESC' if descending else 'ASC'}, id {'DESC' if descending else 'ASC'}"
+        cursor = self.db.execute(f"SELECT * FROM games{where} ORDER BY {order} LIMIT ? OFFSET ?", params + [limit, offset])
+        return [dict(row) for row in cursor]
+
+    # Streams every matching game without loading the whole history
+    def iter_games(self, page_size=1000, **filters):
+        where, params = self._where(filters)
+        cursor = self.db.execute(f"SELECT * FROM games{where} ORDER BY id", params)
+        while rows := cursor.fetchmany(page_size):
+            yield from map(dict, rows)
+
+    def get_summary(self): return list(self.iter_games())
+
+    def clear_history(self):
+        with self.db: self.db.execute("DELETE FROM games")
+        self._notify_reset()
+
+    # index is the 0-based position of the game in insertion order, as shown in the results table
+    def delete_game(self, index):
+        if index < 0: return False
+        with self.db:
+            cursor = self.db.execute("DELETE FROM games WHERE id = (SELECT id FROM games ORDER BY id LIMIT 1 OFFSET ?)", (index,))
+        if cursor.rowcount > 0: self._notify_reset()
+        return cursor.rowcount > 0
+
+    def delete_game_id(self, game_id):
+        with self.db:
+            cursor = self.db.execute("DELETE FROM games WHERE id = ?", (game_id,))
+        if cursor.rowcount > 0: self._notify_reset()
+        return cursor.rowcount > 0
+
+    def _notify_reset(self):
+        for listener in self.listeners: listener.reset(self)
+
+    # Reclaims the space of deleted games
+    def compact(self): self.db.execute("VACUUM")
+
+    def close(self): self.db.close()
+
+    @staticmethod
+    def _where(filters):
+        unknown = set(filters) - set(COLUMNS)
+        if unknown: raise ValueError(f"Unknown column: {', '.join(sorted(unknown))}")
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if not filters: return "", []
+        return " WHERE " + " AND ".join(f"{k} = ?" for k in filters), list(filters.values())
+
+    # Streams the matching games into a CSV file with a header row; returns the number of games written
+    def export_csv(self, path, **filters):
+        written = 0
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, ("id",) + COLUMNS)
+            writer.writeheader()
+            for game in self.iter_games(**filters):
+                writer.writerow(game)
+                written += 1
+        return written
+
+    # Appends the games of a CSV file written by export_csv, `batch` games per transaction (their ids are new)
+    def import_csv(self, path, batch=1000):
+        types = dict(initial_number=int, nodes_visited=int, avg_time=float, timestamp=float, pruning_rate=float)
+        imported, games = 0, []
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                games.append({k: types.get(k, str)(row[k]) for k in COLUMNS if row.get(k) not in (None, "")})
+                if len(games) >= batch:
+                    imported += len(self.extend(games))
+                    games = []
+        return imported + len(self.extend(games))
+
+    # Reads the old comma-separated game_history.dat format
+    @staticmethod
+    def load_legacy(path):
+        try:
+            with open(path, 'r') as f:
+                return [{
+                    "result": p[0], "initial_number": int(p[1]), "nodes_visited": int(p[2]),
+                    "avg_time": float(p[3]), "algorithm": p[4], "starting_player": p[5],
+                    "timestamp": float(p[6]), "pruning_rate": float(p[7]) if len(p) == 8 else 0.0
+                } for line in f if len(p := line.strip().split(',')) in (7, 8)]
+        except Exception as e:
+            print(f"Error loading history: {e}")
+            return []
+
+if __name__ == "__main__":
+    # python history.py export games.csv [database] / python history.py import games.csv [database]
+    command, path = sys.argv[1:3]
+    history = GameHistory(sys.argv[3] if len(sys.argv) > 3 else "game_history.db", legacy_file=None)
+    if command == "export": print(f"{history.export_csv(path)} games -> {path}")
+    elif command == "import": print(f"{history.import_csv(path)} games <- {path}")
+    else: sys.exit(f"Unknown command: {command}")
@@ -0,0 +1,107 @@
+import argparse
+import csv
+import os
+import struct
+import sys
+from array import array
+
+# Move logs: every move of every game (who moved, multiplier, resulting number and scores, and the search's
+# nodes, time and depth for computer moves), keyed on the game's GameHistory id.
+# The file is columnar and chunked: a header, then chunks of up to CHUNK_ROWS moves, each stored as a row count
+# followed by one little-endian array per column. Writers append chunk by chunk, readers stream one chunk at a
+# time and skip the bytes of columns they do not ask for, so logs of millions of games are never loaded whole.
+MAGIC, VERSION = b"ZSML", 1
+HEADER, CHUNK = struct.Struct("<4sB"), struct.Struct("<I")
+COLUMNS = (("game_id", "Q"), ("ply", "H"), ("is_human", "B"), ("multiplier", "B"), ("number", "Q"), ("human_score", "i"),
+           ("computer_score", "i"), ("nodes", "Q"), ("elapsed", "d"), ("depth", "H"))
+# One move packed with every column's type code, to check a row fits before any column is appended to
+ROW = struct.Struct("<" + "".join(code for _, code in COLUMNS))
+CHUNK_ROWS = 65536
+MOVE_LOG_FILE = "move_log.bin"
+
+class MoveLogWriter:
+    def __init__(self, path=MOVE_LOG_FILE, chunk_rows=CHUNK_ROWS):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists: _check_header(path)
+        self.file, self.chunk_rows = open(path, "ab"), chunk_rows
+        if not exists: self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.columns = {name: array(code) for name, code in COLUMNS}
+
+    def __enter__(self): return self
+    # Leaving on an exception drops the moves not flushed yet, e.g. the rest of a game that did not fit
+    def __exit__(self, exc_type, *exc): self.close(flush=exc_type is None)
+
+    def add(self, game_id, ply, is_human, multiplier, number, human_score, computer_score, nodes=0, elapsed=0.0, depth=0):
+        row = (game_id, ply, is_human, multiplier, number, human_score, computer_score, nodes, elapsed, depth)
+        try: ROW.pack(*row)
+        except struct.error as e: raise ValueError(f"Move does not fit the move log: {e}") from None
+        for column, value in zip(self.columns.values(), row): column.append(value)
+        if len(self.columns["game_id"]) >= self.chunk_rows: self.flush()
+
+    # moves: dicts with the COLUMNS keys except game_id, in play order
+    def add_game(self, game_id, moves):
+        for move in moves: self.add(game_id, **move)
+
+    def flush(self):
+        n = len(self.columns["game_id"])
+        if not n: return
+        self.file.write(CHUNK.pack(n))
+        for column in self.columns.values():
+            if sys.byteorder == "big": column.byteswap()
+            self.file.write(column.tobytes())
+        self.file.flush()
+        self.columns = {name: array(code) for name, code in COLUMNS}
+
+    def close(self, flush=True):
+        if flush: self.flush()
+        self.file.close()
+
+def _check_header(path):
+    with open(path, "rb") as f: magic, version = HEADER.unpack(f.read(HEADER.size))
+    if (magic, version) != (MAGIC, VERSION): raise ValueError(f"Not a version {VERSION} move log: {path}")
+
+# Yields (row count, {column: array}) per chunk, decoding only the requested columns
+def iter_chunks(path=MOVE_LOG_FILE, columns=None):
+    _check_header(path)
+    unknown = set(columns or ()) - {name for name, _ in COLUMNS}
+    if unknown: raise ValueError(f"Unknown column: {', '.join(sorted(unknown))}")
+    with open(path, "rb") as f:
+        f.seek(HEADER.size)
+        while head := f.read(CHUNK.size):
+            (n,), chunk = CHUNK.unpack(head), {}
+            for name, code in COLUMNS:
+                size = n * array(code).itemsize
+                if columns is not None and name not in columns:
+                    f.seek(size, os.SEEK_CUR)
+                    continue
+                values = array(code)
+                values.frombytes(f.read(size))
+                if sys.byteorder == "big": values.byteswap()
+                chunk[name] = values
+            yield n, chunk
+
+# Streams the moves as dicts, optionally of one game only
+def iter_moves(path=MOVE_LOG_FILE, game_id=None):
+    names = [name for name, _ in COLUMNS]
+    for _, chunk in iter_chunks(path):
+        for row in zip(*(chunk[name] for name in names)):
+            if game_id is None or row[0] == game_id: yield dict(zip(names, row))
+
+# Streams the log into a CSV file chunk by chunk; returns the number of moves written
+def export_csv(path, csv_path, columns=None):
+    names, written = [name for name, _ in COLUMNS if columns is None or name in columns], 0
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        for n, chunk in iter_chunks(path, names):
+            writer.writerows(zip(*(chunk[name] for name in names)))
+            written += n
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a move log to CSV")
+    parser.add_argument("log", nargs="?", default=MOVE_LOG_FILE)
+    parser.add_argument("csv")
+    parser.add_argument("--columns", nargs="+", choices=[name for name, _ in COLUMNS])
+    args = parser.parse_args()
+    print(f"{export_csv(args.log, args.csv, args.columns)} moves -> {args.csv}")
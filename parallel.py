@@ -0,0 +1,164 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from math import inf
+from engine import DEFAULT_RULES, ORDERINGS, Board, GameState, SearchCancelled, SearchEngine, SearchResult, add_rules_arguments, rules_from_args
+
+# Parallel root splitting:
+# the root's subtrees (and with split=2 also the second-ply subtrees) are searched in a process pool.
+# Alpha-beta uses Young Brothers Wait: at every split node the eldest move is searched first, and its score
+# narrows the window the younger brothers are then searched with, all at once. Bounds are passed to a worker
+# when its subtree is submitted; workers do not see bounds found by the others while they run.
+# Minimax has no bounds, so all subtrees are searched at once.
+# The chosen move and score are the serial search's; the node count is usually a bit higher.
+PARALLEL_ALGORITHMS = ("minimax", "alphabeta")
+
+# Runs in a worker: one subtree searched by a serial engine; board is Board.key()
+def _search_subtree(algorithm, depth, ordering, rules, board, alpha, beta):
+    number, human_score, computer_score, is_human_turn = board
+    engine = SearchEngine(algorithm, depth, ordering=ordering, rules=rules)
+    result = engine.search(Board(number, human_score, computer_score, is_human_turn, rules), not is_human_turn, alpha=alpha, beta=beta)
+    return result.score, result.nodes_visited, result.cutoffs, result.pruned_moves, result.generated_moves
+
+class ParallelSearch:
+    def __init__(self, algorithm="alphabeta", depth=3, processes=None, split=1, ordering=(), rules=None, executor=None):
+        if algorithm not in PARALLEL_ALGORITHMS: raise ValueError(f"Unknown algorithm: {algorithm}")
+        if split not in (1, 2): raise ValueError("split must be 1 (root) or 2 (root and second ply)")
+        self.algorithm, self.depth, self.split, self.rules = algorithm, depth, split, rules
+        self.ordering = tuple(o for o in ORDERINGS if o in ordering)
+        # An executor passed in is shared (e.g. by every game of the GUI) and not shut down by close()
+        self.executor, self._owned = (executor, False) if executor is not None else (ProcessPoolExecutor(processes), True)
+        self.nodes_visited = self.cutoffs = self.pruned_moves = self.generated_moves = 0
+        self.tracer = self.book = self._cancel = None
+
+    # Same interface as SearchEngine, so callers can use either
+    @property
+    def progress(self): return self.depth, self.nodes_visited
+
+    def book_move(self, state, is_maximizing=True): return None
+
+    def search(self, state, is_maximizing=True, cancel=None):
+        self._cancel = cancel
+        self.nodes_visited = self.cutoffs = self.pruned_moves = self.generated_moves = 0
+        board = Board.from_state(state, not is_maximizing, self.rules)
+        start_time = time.perf_counter()
+        try: m, score = self._split(board, self.depth, -inf, inf, self.split)
+        finally: self._cancel = None
+        elapsed = time.perf_counter() - start_time
+        return SearchResult(m, score, self.nodes_visited, elapsed, depth=self.depth, cutoffs=self.cutoffs,
+                            pruned_moves=self.pruned_moves, generated_moves=self.generated_moves,
+                            iterations=[dict(depth=self.depth, nodes=self.nodes_visited, elapsed=elapsed, multiplier=m, score=score, completed=True)])
+
+    def _submit(self, board, depth, alpha, beta):
+        return self.executor.submit(_search_subtree, self.algorithm, depth, self.ordering, board.rules, board.key(),
+                                    alpha, beta)
+
+    def _result(self, future):
+        score, nodes, cutoffs, pruned, generated = future.result()
+        self.nodes_visited, self.cutoffs = self.nodes_visited + nodes, self.cutoffs + cutoffs
+        self.pruned_moves, self.generated_moves = self.pruned_moves + pruned, self.generated_moves + generated
+        return score
+
+    def _wait(self, futures):
+        while True:
+            if self._cancel is not None and self._cancel.is_set():
+                for f in futures: f.cancel()
+                raise SearchCancelled()
+            if not wait(futures, timeout=0.05).not_done: return
+
+    # Searches the node in this process; its children are split again or searched in the pool
+    def _split(self, board, depth, alpha, beta, split):
+        self.nodes_visited += 1
+        if board.is_terminal() or depth == 0: return None, board.get_score()
+        is_maximizing, alphabeta = not board.is_human_turn, self.algorithm == "alphabeta"
+        moves = board.rules.multipliers
+        self.generated_moves += len(moves) if alphabeta else 0
+        best_multiplier, best_score = None, -inf if is_maximizing else inf
+
+        def better(score): return best_multiplier is None or (score > best_score if is_maximizing else score < best_score)
+
+        # The eldest brother: split further, or searched alone so its score bounds the others
+        younger = moves
+        if alphabeta:
+            board.make(moves[0])
+            if split > 1: _, score = self._split(board, depth - 1, alpha, beta, split - 1)
+            else:
+                future = self._submit(board, depth - 1, alpha, beta)
+                self._wait([future])
+                score = self._result(future)
+            board.unmake()
+            best_multiplier, best_score, younger = moves[0], score, moves[1:]
+            if is_maximizing: alpha = max(alpha, score)
+            else: beta = min(beta, score)
+            if beta <= alpha:
+                self.cutoffs, self.pruned_moves = self.cutoffs + 1, self.pruned_moves + len(younger)
+                return best_multiplier, best_score
+
+        # The younger brothers at once: whole subtrees, or with split > 1 their children (one pool task each)
+        jobs = []
+        for m in younger:
+            board.make(m)
+            if split > 1 and not board.is_terminal() and depth > 1:
+                self.nodes_visited += 1
+                self.generated_moves += len(moves) if alphabeta else 0
+                children = []
+                for c in moves:
+                    board.make(c)
+                    children.append(self._submit(board, depth - 2, alpha, beta))
+                    board.unmake()
+                jobs.append((m, not board.is_human_turn, children))
+            else:
+                jobs.append((m, None, [self._submit(board, depth - 1, alpha, beta)]))
+            board.unmake()
+        self._wait([f for _, _, futures in jobs for f in futures])
+        for m, child_maximizing, futures in jobs:
+            scores = [self._result(f) for f in futures]
+            score = scores[0] if child_maximizing is None else max(scores) if child_maximizing else min(scores)
+            if better(score): best_multiplier, best_score = m, score
+        return best_multiplier, best_score
+
+    def close(self):
+        if self._owned: self.executor.shutdown(cancel_futures=True)
+
+# Serial vs parallel time for the computer's first move from every starting number
+def compare(algorithm="alphabeta", depth=6, processes=None, split=1, ordering=(), rules=DEFAULT_RULES, numbers=None, repeat=3):
+    parallel, rows = ParallelSearch(algorithm, depth, processes, split, ordering, rules), []
+    try:
+        for number in rules.starts() if numbers is None else numbers:
+            state = GameState(number, is_human_turn=False, rules=rules)
+            serial_times, parallel_times = [], []
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                s = SearchEngine(algorithm, depth, ordering=ordering, rules=rules).search(state)
+                serial_times.append(time.perf_counter() - start_time)
+                start_time = time.perf_counter()
+                p = parallel.search(state)
+                parallel_times.append(time.perf_counter() - start_time)
+            rows.append(dict(number=number, multiplier=s.multiplier, same_move=s.multiplier == p.multiplier and s.score == p.score,
+                             serial_nodes=s.nodes_visited, parallel_nodes=p.nodes_visited, serial_time=min(serial_times),
+                             parallel_time=min(parallel_times), speedup=min(serial_times) / min(parallel_times)))
+    finally: parallel.close()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel root-split search")
+    parser.add_argument("--algorithm", choices=PARALLEL_ALGORITHMS, default="alphabeta")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--split", type=int, choices=(1, 2), default=1, help="plies split across processes")
+    parser.add_argument("--ordering", nargs="*", choices=ORDERINGS, default=[])
+    parser.add_argument("--numbers", nargs="+", type=int, help="initial numbers (default: the start range of the rules)")
+    parser.add_argument("--repeat", type=int, default=3)
+    add_rules_arguments(parser)
+    args = parser.parse_args()
+
+    rows = compare(args.algorithm, args.depth, args.processes, args.split, args.ordering, rules_from_args(parser, args),
+                   args.numbers, args.repeat)
+    print(f"{'n':>4} {'move':>4} {'same':>5} {'serial nodes':>12} {'parallel nodes':>14} {'serial (s)':>10} {'parallel (s)':>12} {'speedup':>7}")
+    for r in rows:
+        print(f"{r['number']:>4} {r['multiplier']:>4} {str(r['same_move']):>5} {r['serial_nodes']:>12} {r['parallel_nodes']:>14} "
+              f"{r['serial_time']:>10.4f} {r['parallel_time']:>12.4f} {r['speedup']:>7.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from engine import ALGORITHMS, DEFAULT_RULES, ORDERINGS, Board, SearchEngine, _json_score, add_rules_arguments, rules_from_args
+from history import GameHistory
+from stats import Histogram
+
+# Game server: many concurrent games over TCP, one JSON object per line, e.g. with `nc localhost 8765`:
+#   {"cmd": "new", "number": 9, "starter": "human", "algorithm": "alphabeta", "depth": 3, "ordering": ["pv"]}
+#   {"cmd": "move", "session": 1, "multiplier": 3}      plays the human move and answers with the computer's reply
+#   {"cmd": "state", "session": 1}, {"cmd": "stats", "session": 1}, {"cmd": "close", "session": 1}, {"cmd": "server"}
+# Every reply is one JSON line with "ok" (and "error" when it is false). Searches run in a process pool, so a deep
+# search in one session does not hold up the others. Search results are shared across sessions through an LRU
+# cache keyed on the position and engine settings; only the event loop writes it, the workers never see it.
+# Sessions belong to the connection that created them and are dropped when it closes.
+PORT = 8765
+STARTERS = ("human", "computer")
+
+# Engines are kept per worker process and settings, so they (and the exact solver's table) are not rebuilt for every move
+_engines = {}
+
+def _search(settings, number, human_score, computer_score):
+    engine = _engines.get(settings)
+    if engine is None:
+        algorithm, depth, ordering, rules, time_budget = settings
+        engine = _engines[settings] = SearchEngine(algorithm, depth, time_budget=time_budget, ordering=ordering, rules=rules)
+    result = engine.search(Board(number, human_score, computer_score, is_human_turn=False, rules=settings[3]))
+    return result.multiplier, result.score, result.nodes_visited, result.elapsed, result.pruned_moves, result.generated_moves
+
+class Latency:
+    def __init__(self): self.histogram, self.total, self.max = Histogram(), 0.0, 0.0
+
+    def add(self, seconds):
+        self.histogram.add(seconds)
+        self.total, self.max = self.total + seconds, max(self.max, seconds)
+
+    def as_dict(self):
+        n = self.histogram.total
+        return dict(requests=n, mean=self.total / n if n else 0.0, p50=self.histogram.percentile(50),
+                    p90=self.histogram.percentile(90), p99=self.histogram.percentile(99), max=self.max)
+
+class Session:
+    def __init__(self, session_id, number, starter, settings):
+        self.id, self.initial_number, self.starter, self.settings = session_id, number, starter, settings
+        self.board = Board(number, is_human_turn=starter == "human", rules=settings[3])
+        self.latency = Latency()
+        self.nodes = self.moves = self.pruned = self.generated = self.cache_hits = 0
+        self.search_time = 0.0
+
+    def result(self):
+        board = self.board
+        if not board.is_terminal(): return None
+        if board.human_score > board.computer_score: return "HUMAN WINS"
+        return "COMPUTER WINS" if board.human_score < board.computer_score else "DRAW"
+
+    def state(self):
+        b = self.board
+        return dict(session=self.id, number=b.number, human_score=b.human_score, computer_score=b.computer_score,
+                    turn="human" if b.is_human_turn else "computer", result=self.result())
+
+    def stats(self):
+        return dict(session=self.id, algorithm=self.settings[0], depth=self.settings[1], computer_moves=self.moves,
+                    nodes_visited=self.nodes, search_time=self.search_time, cache_hits=self.cache_hits, latency=self.latency.as_dict())
+
+class GameServer:
+    def __init__(self, processes=None, cache_size=100_000, history=None, max_depth=8, time_budget=None, rules=DEFAULT_RULES):
+        self.pool = ProcessPoolExecutor(processes)
+        self.cache, self.cache_size, self.pending = OrderedDict(), cache_size, {}
+        self.cache_hits = self.cache_misses = 0
+        self.history, self.max_depth, self.time_budget, self.rules = history, max_depth, time_budget, rules
+        self.sessions, self.ids, self.latency = {}, itertools.count(1), Latency()
+        self.commands = dict(new=self.cmd_new, move=self.cmd_move, state=self.cmd_state, stats=self.cmd_stats,
+                             close=self.cmd_close, server=self.cmd_server)
+
+    async def handle(self, reader, writer):
+        owned = set()
+        try:
+            while line := await reader.readline():
+                start_time = time.perf_counter()
+                session = None
+                try:
+                    request = json.loads(line)
+                    command = self.commands.get(request.get("cmd"))
+                    if command is None: raise ValueError(f"Unknown command: {request.get('cmd')}")
+                    session = self.sessions.get(request.get("session"))
+                    reply = await command(request, owned)
+                    reply["ok"] = True
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    reply = dict(ok=False, error=str(e))
+                except BrokenExecutor as e:
+                    reply = dict(ok=False, error=f"Search failed: {e}")
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+                elapsed = time.perf_counter() - start_time
+                self.latency.add(elapsed)
+                if session is None and reply.get("session") in self.sessions: session = self.sessions[reply["session"]]
+                if session is not None: session.latency.add(elapsed)
+        except ConnectionError: pass
+        finally:
+            for session_id in owned: self.sessions.pop(session_id, None)
+            writer.close()
+
+    def session(self, request, owned):
+        session_id = request.get("session")
+        if session_id not in owned: raise ValueError(f"Unknown session: {session_id}")
+        return self.sessions[session_id]
+
+    async def cmd_new(self, request, owned):
+        number, starter = request["number"], request.get("starter", "human")
+        algorithm, depth = request.get("algorithm", "alphabeta"), request.get("depth", 3)
+        if not isinstance(number, int) or not isinstance(depth, int): raise ValueError("number and depth must be integers")
+        ordering = request.get("ordering", [])
+        if not isinstance(ordering, list): raise ValueError("ordering must be a list")
+        if unknown := set(ordering) - set(ORDERINGS): raise ValueError(f"Unknown move ordering: {', '.join(sorted(unknown))}")
+        ordering = tuple(o for o in ORDERINGS if o in ordering)
+        if number not in self.rules.starts():
+            raise ValueError(f"Number must be between {self.rules.start_range[0]} and {self.rules.start_range[1]}")
+        if starter not in STARTERS: raise ValueError(f"Unknown starter: {starter}")
+        if algorithm not in ALGORITHMS: raise ValueError(f"Unknown algorithm: {algorithm}")
+        if not 1 <= depth <= self.max_depth: raise ValueError(f"Depth must be between 1 and {self.max_depth}")
+        session = Session(next(self.ids), number, starter, (algorithm, depth, ordering, self.rules, self.time_budget))
+        reply = {}
+        # A session only exists once the computer's first move (if it starts) was found
+        if starter == "computer": reply["computer"] = await self.computer_move(session)
+        self.sessions[session.id] = session
+        owned.add(session.id)
+        return dict(reply, **session.state())
+
+    async def cmd_move(self, request, owned):
+        session = self.session(request, owned)
+        board, multiplier = session.board, request["multiplier"]
+        if board.is_terminal(): raise ValueError("The game is over")
+        if not board.is_human_turn: raise ValueError("It is the computer's turn")
+        if not isinstance(multiplier, int) or multiplier not in self.rules.multipliers: raise ValueError(f"Unknown multiplier: {multiplier}")
+        board.make(multiplier)
+        if board.is_terminal():
+            self.record(session)
+            return session.state()
+        # The human move only stands once the computer's reply was found, so a failed search can be retried
+        try: reply = dict(computer=await self.computer_move(session))
+        except BaseException:
+            board.unmake()
+            raise
+        return dict(reply, **session.state())
+
+    async def cmd_state(self, request, owned): return self.session(request, owned).state()
+    async def cmd_stats(self, request, owned): return self.session(request, owned).stats()
+
+    async def cmd_close(self, request, owned):
+        session = self.session(request, owned)
+        owned.discard(session.id)
+        del self.sessions[session.id]
+        return session.stats()
+
+    async def cmd_server(self, request, owned):
+        return dict(sessions=len(self.sessions), cache_entries=len(self.cache), cache_hits=self.cache_hits,
+                    cache_misses=self.cache_misses, latency=self.latency.as_dict())
+
+    # The computer's reply for a session; identical positions searched with identical settings are only
+    # searched once, also when several sessions ask at the same time
+    async def computer_move(self, session):
+        board = session.board
+        key = session.settings + (board.number, board.computer_score - board.human_score)
+        result, cached = self.cache.get(key), True
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+        elif key in self.pending:
+            self.cache_hits += 1
+            result = await asyncio.shield(self.pending[key])
+        else:
+            cached, self.cache_misses = False, self.cache_misses + 1
+            future = self.pending[key] = asyncio.get_running_loop().run_in_executor(
+                self.pool, _search, session.settings, board.number, board.human_score, board.computer_score)
+            try: result = await future
+            finally: del self.pending[key]
+            self.cache[key] = result
+            if len(self.cache) > self.cache_size: self.cache.popitem(last=False)
+        multiplier, score, nodes, elapsed, pruned, generated = result
+        board.make(multiplier)
+        # A cached move reports the stats of the search that produced it, so recorded games stay comparable
+        session.moves, session.nodes, session.search_time = session.moves + 1, session.nodes + nodes, session.search_time + elapsed
+        session.pruned, session.generated, session.cache_hits = session.pruned + pruned, session.generated + generated, session.cache_hits + cached
+        if board.is_terminal(): self.record(session)
+        return dict(multiplier=multiplier, score=_json_score(score), nodes=nodes, elapsed=elapsed, cached=cached)
+
+    def record(self, session):
+        if self.history is None: return
+        self.history.add_result(result=session.result(), initial_number=session.initial_number, nodes_visited=session.nodes,
+                                avg_time=session.search_time / session.moves if session.moves else 0,
+                                algorithm=session.settings[0], starting_player=session.starter,
+                                pruning_rate=session.pruned / session.generated if session.generated else 0.0)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        if self.history is not None: self.history.close()
+
+async def serve(server, host="127.0.0.1", port=PORT):
+    tcp = await asyncio.start_server(server.handle, host, port)
+    print(f"Serving on {', '.join(str(s.getsockname()) for s in tcp.sockets)}")
+    async with tcp: await tcp.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Number game server (JSON lines over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="search worker processes")
+    parser.add_argument("--cache-size", type=int, default=100_000, help="searched positions shared across sessions")
+    parser.add_argument("--max-depth", type=int, default=8, help="deepest search a session may ask for")
+    parser.add_argument("--time-budget", type=float, help="seconds per computer move (iterative deepening)")
+    parser.add_argument("--history", help="GameHistory database to record finished games in")
+    add_rules_arguments(parser)
+    args = parser.parse_args()
+
+    history = GameHistory(args.history, legacy_file=None) if args.history else None
+    server = GameServer(args.processes, args.cache_size, history, args.max_depth, args.time_budget, rules_from_args(parser, args))
+    try: asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt: pass
+    finally:
+        server.close()
+        print(json.dumps(server.latency.as_dict()))
+
+if __name__ == "__main__":
+    main()
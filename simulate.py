@@ -0,0 +1,133 @@
+import argparse
+import itertools
+import os
+import random
+import time
+from multiprocessing import Pool
+from engine import ALGORITHMS, DEFAULT_RULES, ORDERINGS, Board, SearchEngine, add_rules_arguments, rules_from_args
+from history import GameHistory
+from movelog import MoveLogWriter
+
+# Headless engine-vs-engine self-play:
+# every combination of human-side config, computer-side config, starting player and initial number
+# is played `repeat` times across a process pool, and each game is appended to a GameHistory file.
+# The history row describes the computer side (algorithm, nodes, avg time), like a GUI game.
+
+# "alphabeta:5:pv+killer" -> ("alphabeta", 5, ("pv", "killer")); the depth defaults to 3, no move ordering
+def parse_player(spec):
+    algorithm, _, rest = spec.partition(":")
+    depth, _, ordering = rest.partition(":")
+    if algorithm not in ALGORITHMS: raise argparse.ArgumentTypeError(f"Unknown algorithm: {algorithm}")
+    ordering = tuple(o for o in ordering.split("+") if o)
+    if unknown := set(ordering) - set(ORDERINGS): raise argparse.ArgumentTypeError(f"Unknown move ordering: {', '.join(sorted(unknown))}")
+    return algorithm, int(depth) if depth else 3, ordering
+
+def player_name(player):
+    algorithm, depth, ordering = player
+    return f"{algorithm}:{depth}" + (f":{'+'.join(ordering)}" if ordering else "")
+
+# With record_moves=True the entry also has "moves": one movelog row per move
+def play_game(human, computer, initial_number, starting_player, random_plies=0, seed=None, rules=DEFAULT_RULES, record_moves=False):
+    engines = {is_human: SearchEngine(algorithm, depth, ordering=ordering, rules=rules)
+               for is_human, (algorithm, depth, ordering) in ((True, human), (False, computer))}
+    board = Board(initial_number, is_human_turn=starting_player == "human", rules=rules)
+    rng = random.Random(seed)
+    nodes = moves = ply = pruned = generated = 0
+    total_time, log = 0.0, []
+    while not board.is_terminal():
+        is_human = board.is_human_turn
+        # Optional random opening plies so repeated games do not all follow the same line
+        if ply < random_plies:
+            multiplier, result = rng.choice(rules.multipliers), None
+        else:
+            result = engines[is_human].search(board, is_maximizing=not is_human)
+            multiplier = result.multiplier
+            if not is_human:
+                nodes, total_time, moves = nodes + result.nodes_visited, total_time + result.elapsed, moves + 1
+                pruned, generated = pruned + result.pruned_moves, generated + result.generated_moves
+        board.make(multiplier)
+        if record_moves:
+            log.append(dict(ply=ply, is_human=is_human, multiplier=multiplier, number=board.number, human_score=board.human_score,
+                            computer_score=board.computer_score, nodes=result.nodes_visited if result else 0,
+                            elapsed=result.elapsed if result else 0.0, depth=result.depth if result else 0))
+        ply += 1
+
+    if board.human_score > board.computer_score: outcome = "HUMAN WINS"
+    elif board.human_score < board.computer_score: outcome = "COMPUTER WINS"
+    else: outcome = "DRAW"
+    entry = dict(result=outcome, initial_number=initial_number, nodes_visited=nodes,
+                 avg_time=total_time / moves if moves else 0, algorithm=computer[0],
+                 starting_player=starting_player, timestamp=time.time(),
+                 pruning_rate=pruned / generated if generated else 0.0)
+    if record_moves: entry["moves"] = log
+    return entry
+
+def _play(task):
+    key, (human, computer, number, starter, random_plies, seed, rules, record_moves) = task
+    return key, play_game(human, computer, number, starter, random_plies, seed, rules, record_moves)
+
+def tasks(humans, computers, starters, numbers, repeat, random_plies=0, seed=0, rules=DEFAULT_RULES, record_moves=False):
+    configs = itertools.product(humans, computers, starters, numbers, range(repeat))
+    for i, (human, computer, starter, number, _) in enumerate(configs):
+        yield (human, computer, starter), (human, computer, number, starter, random_plies, seed + i, rules, record_moves)
+
+# Yields (config, history entry) pairs as games finish; numbers defaults to the rules' start range
+def run(humans, computers, starters=("human", "computer"), numbers=None, repeat=1, random_plies=0, seed=0, processes=None,
+        chunksize=16, rules=DEFAULT_RULES, record_moves=False):
+    work = tasks(humans, computers, starters, rules.starts() if numbers is None else numbers, repeat, random_plies, seed, rules,
+                 record_moves)
+    if processes == 1:
+        yield from map(_play, work)
+        return
+    with Pool(processes) as pool:
+        yield from pool.imap_unordered(_play, work, chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine-vs-engine self-play")
+    parser.add_argument("--human", nargs="+", type=parse_player, default=[("minimax", 3, ())],
+                        help="human-side configs: algorithm[:depth[:ordering+ordering]], e.g. alphabeta:5:pv+history")
+    parser.add_argument("--computer", nargs="+", type=parse_player, default=[("alphabeta", 3, ())], help="computer-side configs")
+    parser.add_argument("--starter", nargs="+", choices=("human", "computer"), default=["human", "computer"])
+    parser.add_argument("--numbers", nargs="+", type=int, help="initial numbers (default: the start range of the rules)")
+    add_rules_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=1, help="games per configuration")
+    parser.add_argument("--random-plies", type=int, default=0, help="random opening plies per game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--history", default="selfplay_history.db", help="GameHistory database to append the games to")
+    parser.add_argument("--batch", type=int, default=1000, help="games per history write")
+    parser.add_argument("--move-log", help="move log file (see movelog.py) to append every move of every game to")
+    args = parser.parse_args()
+
+    rules = rules_from_args(parser, args)
+    history, batch, summary = GameHistory(args.history, legacy_file=None), [], {}
+    log = MoveLogWriter(args.move_log) if args.move_log else None
+
+    def write(games):
+        for game in history.extend(games):
+            if log is not None: log.add_game(game["id"], game["moves"])
+
+    start_time = time.perf_counter()
+    for key, entry in run(args.human, args.computer, args.starter, args.numbers, args.repeat,
+                          args.random_plies, args.seed, args.processes, rules=rules, record_moves=log is not None):
+        batch.append(entry)
+        if len(batch) >= args.batch:
+            write(batch)
+            batch = []
+        stats = summary.setdefault(key, {"HUMAN WINS": 0, "COMPUTER WINS": 0, "DRAW": 0, "games": 0, "nodes": 0, "pruning": 0.0})
+        stats[entry["result"]] += 1
+        stats["games"] += 1
+        stats["nodes"] += entry["nodes_visited"]
+        stats["pruning"] += entry["pruning_rate"]
+    write(batch)
+    if log is not None: log.close()
+
+    total = sum(s["games"] for s in summary.values())
+    print(f"{total} games in {time.perf_counter() - start_time:.2f}s -> {args.history}")
+    for (human, computer, starter), s in sorted(summary.items()):
+        print(f"human {player_name(human)} vs computer {player_name(computer)}, {starter} starts: "
+              f"{s['HUMAN WINS']} human / {s['COMPUTER WINS']} computer / {s['DRAW']} draws, "
+              f"avg nodes per game {s['nodes'] / s['games']:.1f}, avg pruning {s['pruning'] / s['games']:.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import struct
+import sys
+from engine import DEFAULT_RULES
+
+# Exact endgame solver:
+# The game is finite, so the exact value of every reachable position is computed once by memoized DP.
+# Each move changes the score difference (computer - human) by an amount that only depends on the
+# number reached and on who moved, so the final difference under perfect play is
+#     current difference + delta(number, side to move)
+# The (number, score difference, side to move) table therefore folds down to (number, side to move),
+# and the value of any position, including its score difference, is one dictionary lookup.
+# The computer maximizes the final difference, the human minimizes it; its sign is the game result.
+# Each set of rules has its own table.
+TABLE_FILE = "solver_table.bin"
+MAGIC, VERSION = b"ZSNG", 2
+HEADER, ENTRY = struct.Struct("<4sBQiiB"), struct.Struct("<QBiB")
+
+# Table file for a variant: TABLE_FILE for the original game, e.g. solver_table_1000000_2-3-4_1-1.bin otherwise
+def table_file(rules):
+    if rules == DEFAULT_RULES: return TABLE_FILE
+    return f"solver_table_{rules.target}_{'-'.join(map(str, rules.multipliers))}_{rules.even_penalty}-{rules.odd_bonus}.bin"
+
+class Solver:
+    def __init__(self, rules=DEFAULT_RULES):
+        # (number, is_human_turn) -> (delta of the final score difference, best multiplier)
+        self.table, self.rules = {}, rules
+
+    def __len__(self): return len(self.table)
+
+    def solve(self, number, is_human_turn):
+        key = (number, is_human_turn)
+        entry = self.table.get(key)
+        if entry is not None: return entry
+        if number >= self.rules.target:
+            entry = (0, None)
+        else:
+            best_delta = best_multiplier = None
+            for m in self.rules.multipliers:
+                hs, cs = self.rules.score_move(number * m, 0, 0, is_human_turn)
+                delta = cs - hs + self.solve(number * m, not is_human_turn)[0]
+                if best_multiplier is None or (delta < best_delta if is_human_turn else delta > best_delta):
+                    best_delta, best_multiplier = delta, m
+            entry = (best_delta, best_multiplier)
+        self.table[key] = entry
+        return entry
+
+    # Every position reachable from a legal starting number, with either player to move first
+    def solve_all(self, starts=None):
+        for number in self.rules.starts() if starts is None else starts:
+            self.solve(number, True)
+            self.solve(number, False)
+        return self
+
+    # Final score difference (computer - human) of the position under perfect play
+    def value(self, state, is_human_turn=None):
+        side = state.is_human_turn if is_human_turn is None else is_human_turn
+        return state.computer_score - state.human_score + self.solve(state.number, side)[0]
+
+    def best_move(self, state, is_maximizing=True):
+        return self.solve(state.number, not is_maximizing)[1]
+
+    # Binary table: header (magic, version, target, even penalty, odd bonus, multiplier count), the multipliers,
+    # then one 14-byte (number, side, delta, best multiplier) record per position. The file is written under a
+    # temporary name and renamed, so processes loading it while another one saves never see half a table.
+    def save(self, path=None):
+        rules, path = self.rules, table_file(self.rules) if path is None else path
+        with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, rules.target, rules.even_penalty, rules.odd_bonus, len(rules.multipliers))
+                    + bytes(rules.multipliers))
+            f.write(b"".join(ENTRY.pack(n, side, delta, m or 0) for (n, side), (delta, m) in self.table.items()))
+        os.replace(f.name, path)
+
+    # Returns False (and loads nothing) if the file is missing, truncated or was built for other rules
+    def load(self, path=None):
+        try:
+            with open(table_file(self.rules) if path is None else path, "rb") as f: data = f.read()
+        except FileNotFoundError: return False
+        if len(data) < HEADER.size: return False
+        magic, version, *scoring, n = HEADER.unpack_from(data)
+        multipliers, rules = tuple(data[HEADER.size:HEADER.size + n]), self.rules
+        if (magic, version) != (MAGIC, VERSION) or scoring != [rules.target, rules.even_penalty, rules.odd_bonus] \
+                or multipliers != rules.multipliers: return False
+        if (len(data) - HEADER.size - n) % ENTRY.size: return False
+        self.table = {(number, bool(side)): (delta, m or None)
+                      for number, side, delta, m in ENTRY.iter_unpack(data[HEADER.size + n:])}
+        return True
+
+_solvers = {}
+
+# Shared solver per set of rules: loaded from the table file, or solved and saved on first use
+def get_solver(rules=DEFAULT_RULES, path=None):
+    solver = _solvers.get(rules)
+    if solver is None:
+        solver = Solver(rules)
+        if not solver.load(path):
+            solver.solve_all()
+            try: solver.save(path)
+            except OSError as e: print(f"Error saving solver table: {e}")
+        _solvers[rules] = solver
+    return solver
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else TABLE_FILE
+    solver = Solver().solve_all()
+    solver.save(path)
+    print(f"{len(solver)} positions, {os.path.getsize(path)} bytes")
+    for number in solver.rules.starts():
+        print(f"{number}: human first {solver.solve(number, True)[0]:+d}, computer first {solver.solve(number, False)[0]:+d}")
@@ -0,0 +1,158 @@
+import math
+import sys
+from history import GameHistory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Aggregated game statistics:
+# win rates, mean and percentile nodes and move latency, grouped by algorithm, initial number and
+# starting player. Aggregates are running values updated per appended game; percentiles come from
+# log-bucketed histograms (about 2.5% relative error), so an update is O(1) and groups can be merged.
+# A full recompute over a large history uses NumPy when it is installed.
+GROUP_BY = ("algorithm", "initial_number", "starting_player")
+RESULTS = ("HUMAN WINS", "COMPUTER WINS", "DRAW")
+PERCENTILES = (50, 90, 99)
+BASE = 1.05
+LOG_BASE, ZERO_BUCKET = math.log(BASE), -sys.maxsize
+
+def bucket(value): return ZERO_BUCKET if value <= 0 else round(math.log(value) / LOG_BASE)
+def bucket_value(b): return 0.0 if b == ZERO_BUCKET else BASE ** b
+
+class Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self): self.counts, self.total = {}, 0
+
+    def add(self, value, n=1):
+        b = bucket(value)
+        self.counts[b] = self.counts.get(b, 0) + n
+        self.total += n
+
+    def merge(self, other):
+        for b, n in other.counts.items(): self.counts[b] = self.counts.get(b, 0) + n
+        self.total += other.total
+
+    # Nearest-rank percentile, q in 0..100
+    def percentile(self, q):
+        if not self.total: return 0.0
+        rank, seen = max(1, math.ceil(q / 100 * self.total)), 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank: return bucket_value(b)
+        return bucket_value(max(self.counts))
+
+class GroupStats:
+    __slots__ = ("games", "results", "nodes_sum", "time_sum", "nodes", "times")
+
+    def __init__(self):
+        self.games, self.results, self.nodes_sum, self.time_sum = 0, dict.fromkeys(RESULTS, 0), 0, 0.0
+        self.nodes, self.times = Histogram(), Histogram()
+
+    def add(self, game):
+        self.games += 1
+        self.results[game["result"]] = self.results.get(game["result"], 0) + 1
+        self.nodes_sum += game["nodes_visited"]
+        self.time_sum += game["avg_time"]
+        self.nodes.add(game["nodes_visited"])
+        self.times.add(game["avg_time"])
+
+    def merge(self, other):
+        self.games += other.games
+        for result, n in other.results.items(): self.results[result] = self.results.get(result, 0) + n
+        self.nodes_sum += other.nodes_sum
+        self.time_sum += other.time_sum
+        self.nodes.merge(other.nodes)
+        self.times.merge(other.times)
+
+    def as_dict(self):
+        games = self.games or 1
+        row = dict(games=self.games, human_win_rate=self.results["HUMAN WINS"] / games,
+                   computer_win_rate=self.results["COMPUTER WINS"] / games, draw_rate=self.results["DRAW"] / games,
+                   mean_nodes=self.nodes_sum / games, mean_time=self.time_sum / games)
+        for q in PERCENTILES:
+            row[f"p{q}_nodes"], row[f"p{q}_time"] = self.nodes.percentile(q), self.times.percentile(q)
+        return row
+
+# Subscribe one to a GameHistory (history.listeners.append(aggregator)) to keep it up to date:
+# the history calls add() for every stored game and reset() after deletions
+class StatsAggregator:
+    def __init__(self, group_by=GROUP_BY):
+        self.group_by, self.groups = tuple(group_by), {}
+
+    @classmethod
+    def from_history(cls, history, group_by=GROUP_BY, vectorized=None):
+        aggregator = cls(group_by)
+        aggregator.reset(history, vectorized)
+        return aggregator
+
+    def add(self, game):
+        key = tuple(game[column] for column in self.group_by)
+        group = self.groups.get(key)
+        if group is None: group = self.groups[key] = GroupStats()
+        group.add(game)
+
+    def reset(self, history, vectorized=None):
+        self.groups = {}
+        if vectorized or vectorized is None and np is not None: self._recompute_numpy(history)
+        else:
+            for game in history.iter_games(): self.add(game)
+
+    # One row per group; by (a subset of group_by) rolls the groups up, e.g. by=("algorithm",)
+    def summary(self, by=None):
+        by = self.group_by if by is None else tuple(by)
+        index = [self.group_by.index(column) for column in by]
+        merged = {}
+        for key, group in self.groups.items():
+            subkey = tuple(key[i] for i in index)
+            if subkey not in merged: merged[subkey] = GroupStats()
+            merged[subkey].merge(group)
+        return [dict(zip(by, key), **merged[key].as_dict()) for key in sorted(merged, key=lambda k: tuple(map(str, k)))]
+
+    # Full recompute: every group gets an integer code, then counts, sums and histogram buckets
+    # are computed column-wise with bincount/unique instead of one add() per game
+    def _recompute_numpy(self, history):
+        columns = self.group_by + ("result", "nodes_visited", "avg_time")
+        rows = history.db.execute(f"SELECT {', '.join(columns)} FROM games").fetchall()
+        if not rows: return
+        data = list(zip(*rows))
+        codes, keys, size = np.zeros(len(rows), dtype=np.int64), [], 1
+        for values in data[:len(self.group_by)]:
+            uniques, inverse = np.unique(np.asarray(values), return_inverse=True)
+            keys.append(uniques.tolist())
+            codes, size = codes * len(uniques) + inverse.reshape(-1), size * len(uniques)
+        def group_key(code):
+            key = []
+            for values in reversed(keys):
+                code, i = divmod(code, len(values))
+                key.append(values[i])
+            return tuple(reversed(key))
+
+        results = np.asarray(data[-3])
+        nodes, times = np.asarray(data[-2], dtype=np.float64), np.asarray(data[-1], dtype=np.float64)
+        games = np.bincount(codes, minlength=size)
+        nodes_sum = np.bincount(codes, weights=nodes, minlength=size)
+        time_sum = np.bincount(codes, weights=times, minlength=size)
+        per_result = {r: np.bincount(codes[results == r], minlength=size) for r in RESULTS}
+        groups = {}
+        for code in np.nonzero(games)[0].tolist():
+            group = groups[code] = self.groups[group_key(code)] = GroupStats()
+            group.games, group.nodes_sum, group.time_sum = int(games[code]), int(nodes_sum[code]), float(time_sum[code])
+            group.results = {r: int(per_result[r][code]) for r in RESULTS}
+        for name, values in (("nodes", nodes), ("times", times)):
+            positive = values > 0
+            logs = np.round(np.log(np.where(positive, values, 1.0)) / LOG_BASE).astype(np.int64)
+            buckets = np.where(positive, logs, np.int64(ZERO_BUCKET))
+            pairs, counts = np.unique(np.stack([codes, buckets]), axis=1, return_counts=True)
+            for (code, b), n in zip(pairs.T.tolist(), counts.tolist()):
+                histogram = getattr(groups[code], name)
+                histogram.counts[b] = n
+                histogram.total += n
+
+if __name__ == "__main__":
+    history = GameHistory(sys.argv[1] if len(sys.argv) > 1 else "game_history.db")
+    aggregator = StatsAggregator.from_history(history)
+    for row in aggregator.summary():
+        print(", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))